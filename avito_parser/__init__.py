@@ -1,9 +1,37 @@
-from .parser import scrape_avito_room_ad, AvitoScrapingException, TooManyRequests
+from .parser import scrape_avito_room_ad
+from .exceptions import (AvitoScrapingException, AvitoUnavailable, TooManyRequests, AdvertisementNotFound,
+                         RateLimitExceeded)
+from .client import AvitoClient, get_client, init_client, close_client
+from .workers import ParserPool, get_pool, init_pool, close_pool
+from .cache import ResultCache, get_cache, init_cache
+from .rate_limit import RateLimiter
+from .urls import extract_item_id
+from .batch import scrape_avito_room_ads, iter_scrape_avito_room_ads
+from .crawler import iter_search_ads
 from .types import Result
 
 __all__ = [
     'scrape_avito_room_ad',
+    'scrape_avito_room_ads',
+    'iter_scrape_avito_room_ads',
     'Result',
     'AvitoScrapingException',
+    'AvitoUnavailable',
     'TooManyRequests',
-]
\ No newline at end of file
+    'AdvertisementNotFound',
+    'RateLimitExceeded',
+    'AvitoClient',
+    'get_client',
+    'init_client',
+    'close_client',
+    'ParserPool',
+    'get_pool',
+    'init_pool',
+    'close_pool',
+    'ResultCache',
+    'get_cache',
+    'init_cache',
+    'extract_item_id',
+    'RateLimiter',
+    'iter_search_ads',
+]
@@ -0,0 +1,80 @@
+from typing import AsyncIterator, Iterable
+from .cache import ResultCache
+from .client import AvitoClient, get_client
+from .exceptions import AvitoScrapingException
+from .parser import scrape_avito_room_ad
+from .types import Result
+import asyncio
+import logging
+
+
+logger = logging.getLogger(__name__)
+
+
+async def _scrape_or_error(
+        url: str,
+        client: AvitoClient,
+        cache: ResultCache | None,
+) -> Result | AvitoScrapingException:
+    try:
+        return await scrape_avito_room_ad(url, client=client, cache=cache)
+    except AvitoScrapingException as e:
+        return e
+    except Exception as e:
+        logger.exception(f"Unexpected error while scraping {url}")
+        return AvitoScrapingException(f"Unexpected error while scraping {url}: {e!r}")
+
+
+async def iter_scrape_avito_room_ads(
+        urls: Iterable[str],
+        client: AvitoClient | None = None,
+        cache: ResultCache | None = None,
+        max_concurrency: int | None = None,
+) -> AsyncIterator[tuple[str, Result | AvitoScrapingException]]:
+    """Scrape ads concurrently and yield (url, result or error) pairs in completion order.
+
+    The number of requests in flight is bounded by ``max_concurrency`` (the client's
+    max_concurrency by default, which is shared with every other scrape going through
+    the same client). Background jobs pass a lower ``max_concurrency`` so that they keep
+    at most a few requests queued in the rate limiter and leave its wait budget to
+    interactive scrapes, and their own ``cache`` to keep out of the interactive one.
+    """
+    client = client or get_client()
+    urls = list(dict.fromkeys(urls))
+    if not urls:
+        return
+
+    pending: asyncio.Queue[str] = asyncio.Queue()
+    for url in urls:
+        pending.put_nowait(url)
+    done: asyncio.Queue[tuple[str, Result | AvitoScrapingException]] = asyncio.Queue()
+
+    async def worker():
+        while True:
+            try:
+                url = pending.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+            done.put_nowait((url, await _scrape_or_error(url, client, cache)))
+
+    workers = [asyncio.create_task(worker()) for _ in range(min(max_concurrency or client.max_concurrency, len(urls)))]
+    try:
+        for _ in range(len(urls)):
+            yield await done.get()
+    finally:
+        for task in workers:
+            task.cancel()
+        await asyncio.gather(*workers, return_exceptions=True)
+
+
+async def scrape_avito_room_ads(
+        urls: Iterable[str],
+        client: AvitoClient | None = None,
+        cache: ResultCache | None = None,
+        max_concurrency: int | None = None,
+) -> dict[str, Result | AvitoScrapingException]:
+    return {
+        url: result async for url, result in iter_scrape_avito_room_ads(
+            urls, client=client, cache=cache, max_concurrency=max_concurrency,
+        )
+    }
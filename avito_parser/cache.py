@@ -0,0 +1,100 @@
+from collections import OrderedDict
+from dataclasses import dataclass
+from .types import Result
+import time
+
+
+@dataclass
+class CacheEntry:
+    result: Result
+    expires_at: float
+    etag: str | None = None
+    last_modified: str | None = None
+
+    @property
+    def is_fresh(self) -> bool:
+        return time.monotonic() < self.expires_at
+
+    @property
+    def can_revalidate(self) -> bool:
+        return bool(self.etag or self.last_modified)
+
+    def conditional_headers(self) -> dict[str, str]:
+        headers = {}
+        if self.etag:
+            headers['If-None-Match'] = self.etag
+        if self.last_modified:
+            headers['If-Modified-Since'] = self.last_modified
+        return headers
+
+
+class ResultCache:
+    """LRU cache of scraped ads keyed by Avito item id.
+
+    Expired entries are kept until evicted so they can be revalidated with
+    If-None-Match / If-Modified-Since instead of being downloaded again.
+    """
+
+    def __init__(self, max_size: int = 1024, ttl: float = 600.0):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries: OrderedDict[int | str, CacheEntry] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.revalidations = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: int | str) -> CacheEntry | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        if entry.is_fresh:
+            self.hits += 1
+        else:
+            self.misses += 1
+        return entry
+
+    def set(self, key: int | str, result: Result, etag: str | None = None, last_modified: str | None = None):
+        if self.max_size <= 0:
+            return
+        self._entries[key] = CacheEntry(
+            result=result,
+            expires_at=time.monotonic() + self.ttl,
+            etag=etag,
+            last_modified=last_modified,
+        )
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def touch(self, key: int | str):
+        entry = self._entries.get(key)
+        if entry is not None:
+            entry.expires_at = time.monotonic() + self.ttl
+            self.revalidations += 1
+
+    def invalidate(self, key: int | str):
+        self._entries.pop(key, None)
+
+    def clear(self):
+        self._entries.clear()
+
+
+_cache: ResultCache | None = None
+
+
+def get_cache() -> ResultCache:
+    global _cache
+    if _cache is None:
+        _cache = ResultCache()
+    return _cache
+
+
+def init_cache(**kwargs) -> ResultCache:
+    global _cache
+    _cache = ResultCache(**kwargs)
+    return _cache
@@ -0,0 +1,155 @@
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+from httpx import AsyncClient, Limits, Timeout, Response
+from .exceptions import RateLimitExceeded
+from .rate_limit import RateLimiter
+import asyncio
+import logging
+
+
+logger = logging.getLogger(__name__)
+
+
+DEFAULT_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) '
+                  'AppleWebKit/537.36 (KHTML, like Gecko) Chrome/58.0.3029.110 Safari/537.3',
+    'Referer': 'https://web.telegram.org/',
+    'Accept-Language': 'da, en-gb, en',
+    'Accept-Encoding': 'gzip, deflate, br',
+    'Accept': 'text / html, application / xhtml + xml, application / xml; '
+              'q = 0.9, image / avif, image / webp, * / *;q = 0.8'
+}
+
+
+class AvitoClient:
+    """Long-lived HTTP client for avito.ru that keeps connections warm between scrapes."""
+
+    def __init__(
+            self,
+            max_connections: int = 10,
+            max_keepalive_connections: int = 5,
+            keepalive_expiry: float = 30.0,
+            timeout: float = 10.0,
+            http2: bool = False,
+            max_concurrency: int = 10,
+            rate_limiter: RateLimiter | None = None,
+            max_retries: int = 1,
+            retry_max_wait: float = 60.0,
+            streaming: bool = True,
+    ):
+        self.limits = Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry,
+        )
+        self.timeout = Timeout(timeout)
+        self.http2 = http2
+        self.max_concurrency = max_concurrency
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self.rate_limiter = rate_limiter or RateLimiter()
+        self.max_retries = max_retries
+        self.retry_max_wait = retry_max_wait
+        self.streaming = streaming
+        self._client: AsyncClient | None = None
+
+    @property
+    def is_started(self) -> bool:
+        return self._client is not None and not self._client.is_closed
+
+    async def start(self):
+        if self.is_started:
+            return
+        self._client = AsyncClient(
+            headers=DEFAULT_HEADERS,
+            limits=self.limits,
+            timeout=self.timeout,
+            http2=self.http2,
+            follow_redirects=True,
+        )
+        logger.info(f"Avito client started (http2={self.http2})")
+
+    async def close(self):
+        if self._client is None:
+            return
+        await self._client.aclose()
+        self._client = None
+        logger.info("Avito client closed")
+
+    async def _send(
+            self,
+            url: str,
+            stream: bool,
+            headers: dict[str, str] | None = None,
+            retry: bool = True,
+    ) -> Response:
+        if not self.is_started:
+            await self.start()
+        response = None
+        for attempt in range((self.max_retries if retry else 0) + 1):
+            try:
+                # a retry follows a 429, so it has to be allowed to sit out the backoff
+                await self.rate_limiter.acquire(url, max_wait=self.retry_max_wait if attempt else None)
+            except RateLimitExceeded as e:
+                logger.error(f"{e} for {url}")
+                if response is not None:
+                    return response
+                raise
+            if response is not None:
+                await response.aclose()
+            request = self._client.build_request('GET', url, headers=headers)
+            async with self._semaphore:
+                response = await self._client.send(request, stream=stream)
+            self.rate_limiter.feedback(url, response.status_code, response.headers.get('Retry-After'))
+            if response.status_code != 429:
+                break
+        return response
+
+    async def get(self, url: str, headers: dict[str, str] | None = None, retry: bool = True) -> Response:
+        return await self._send(url, stream=False, headers=headers, retry=retry)
+
+    @asynccontextmanager
+    async def stream(
+            self,
+            url: str,
+            headers: dict[str, str] | None = None,
+            retry: bool = True,
+    ) -> AsyncIterator[Response]:
+        """Like get, but the body is left unread so it can be consumed (or abandoned) chunk by chunk."""
+        response = await self._send(url, stream=True, headers=headers, retry=retry)
+        try:
+            yield response
+        finally:
+            await response.aclose()
+
+    async def __aenter__(self) -> 'AvitoClient':
+        await self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
+
+
+_client: AvitoClient | None = None
+
+
+def get_client() -> AvitoClient:
+    global _client
+    if _client is None:
+        _client = AvitoClient()
+    return _client
+
+
+async def init_client(**kwargs) -> AvitoClient:
+    global _client
+    if _client is not None:
+        await _client.close()
+    _client = AvitoClient(**kwargs)
+    await _client.start()
+    return _client
+
+
+async def close_client():
+    global _client
+    if _client is not None:
+        await _client.close()
+        _client = None
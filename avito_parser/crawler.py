@@ -0,0 +1,76 @@
+from typing import AsyncIterator
+from urllib.parse import urljoin, urlsplit, urlencode, parse_qsl, urlunsplit
+from httpx import HTTPError, TransportError
+from .client import AvitoClient, get_client
+from .exceptions import AvitoScrapingException, AvitoUnavailable, TooManyRequests
+import logging
+import re
+
+
+logger = logging.getLogger(__name__)
+
+AVITO_BASE_URL = 'https://www.avito.ru'
+
+_ITEM_LINK_PATTERN = re.compile(r'href="(/[^"?#]+/komnaty/[^"?#]+_(\d+))["?#]')
+
+
+def page_url(search_url: str, page: int) -> str:
+    parts = urlsplit(search_url)
+    query = [(key, value) for key, value in parse_qsl(parts.query) if key != 'p']
+    if page > 1:
+        query.append(('p', str(page)))
+    return urlunsplit(parts._replace(query=urlencode(query)))
+
+
+def extract_search_items(content: str) -> list[tuple[int, str]]:
+    """Return (item id, absolute url) of every room ad linked from a search page, in page order."""
+    items = {}
+    for match in _ITEM_LINK_PATTERN.finditer(content):
+        item_id = int(match.group(2))
+        if item_id not in items:
+            items[item_id] = urljoin(AVITO_BASE_URL, match.group(1))
+    return list(items.items())
+
+
+async def iter_search_ads(
+        search_url: str,
+        last_seen_id: int | None = None,
+        max_pages: int = 5,
+        client: AvitoClient | None = None,
+) -> AsyncIterator[tuple[int, str]]:
+    """Walk the search result pages and yield (item id, url) pairs of ads newer than last_seen_id.
+
+    Ids at or below last_seen_id are skipped rather than ending the walk, because promoted
+    listings keep showing up among the new ones. The walk stops at the first page without
+    a new id. Pages are requested lazily, so stopping the iteration early saves the remaining requests.
+    """
+    client = client or get_client()
+    yielded = set()
+
+    for page in range(1, max_pages + 1):
+        url = page_url(search_url, page)
+        try:
+            response = await client.get(url)
+        except TransportError as e:
+            raise AvitoUnavailable(f"Network error while fetching {url}: {e!r}") from e
+        except HTTPError as e:
+            raise AvitoScrapingException(f"HTTP error while fetching {url}: {e!r}") from e
+
+        if response.status_code == 429:
+            raise TooManyRequests(f"Too many requests. Avito blocks request to {url}")
+        elif response.status_code >= 500:
+            raise AvitoUnavailable(f"Avito is unavailable, error {response.status_code} while fetching {url}")
+        elif response.status_code != 200:
+            raise AvitoScrapingException(f"Error {response.status_code} while fetching {url}")
+
+        items = [
+            (item_id, item_url) for item_id, item_url in extract_search_items(response.text)
+            if item_id not in yielded and (last_seen_id is None or item_id > last_seen_id)
+        ]
+        logger.info(f"Found {len(items)} new ads on {url}")
+        if not items:
+            return
+
+        for item_id, item_url in items:
+            yielded.add(item_id)
+            yield item_id, item_url
@@ -0,0 +1,18 @@
+class AvitoScrapingException(Exception):
+    pass
+
+
+class AvitoUnavailable(AvitoScrapingException):
+    """Avito could not be reached or answered with 5xx/429, unlike errors caused by a particular ad."""
+
+
+class TooManyRequests(AvitoUnavailable):
+    pass
+
+
+class AdvertisementNotFound(AvitoScrapingException):
+    pass
+
+
+class RateLimitExceeded(AvitoScrapingException):
+    """The local rate limiter could not hand out a request slot in time, nothing was sent to Avito."""
@@ -0,0 +1,153 @@
+from html import unescape
+import re
+
+
+AREA_PATTERN = re.compile(r'(\d+(?:[.,]\d+)?)\s*м²')
+ROOMS_PATTERN = re.compile(r'(\d+)\s*-\s*к\.')
+FLOOR_PATTERN = re.compile(r'(\d+)\s*/\s*(\d+)\s*эт\.')
+
+_TITLE_PATTERN = re.compile(r'<h1\b[^>]*\bitemprop="name"[^>]*>(.*?)</h1>', re.S)
+_PRICE_PATTERN = re.compile(r'<span\b([^>]*\bitemprop="price"[^>]*)>(.*?)</span>', re.S)
+_PRICE_CONTENT_PATTERN = re.compile(r'\bcontent="(\d+)"')
+_ADDRESS_PATTERN = re.compile(r'<div\b[^>]*\bitemprop="address"[^>]*>(?:(?!</div>).)*?<span\b[^>]*>(.*?)</span>', re.S)
+_DESCRIPTION_PATTERN = re.compile(r'<div\b[^>]*\bitemprop="description"[^>]*>(.*?)</div>', re.S)
+_PARAGRAPH_PATTERN = re.compile(r'<p\b[^>]*>(.*?)</p>', re.S)
+_TAG_PATTERN = re.compile(r'<[^>]+>')
+
+
+def _text(fragment: str) -> str:
+    return unescape(_TAG_PATTERN.sub('', fragment))
+
+
+def parse_title(title: str) -> dict:
+    room_area = AREA_PATTERN.search(title).group(1)
+    flour, flours_in_building = FLOOR_PATTERN.search(title).groups()
+    return {
+        'room_area': float(room_area.replace(',', '.')),
+        'number_of_rooms_in_flat': int(ROOMS_PATTERN.search(title).group(1)),
+        'flour': int(flour),
+        'flours_in_building': int(flours_in_building),
+    }
+
+
+def _build(title: re.Match, price: re.Match, address: re.Match, description: re.Match) -> dict | None:
+    if '<div' in description.group(1):
+        return None
+
+    try:
+        ad = parse_title(_text(title.group(1)))
+    except AttributeError:
+        return None
+
+    price_digits = re.sub(r'\D', '', _text(price.group(2)))
+    if not price_digits:
+        price_content = _PRICE_CONTENT_PATTERN.search(price.group(1))
+        if not price_content:
+            return None
+        price_digits = price_content.group(1)
+
+    description_text = ''
+    for paragraph in _PARAGRAPH_PATTERN.finditer(description.group(1)):
+        description_text += _text(paragraph.group(1)) + '\n'
+
+    return {
+        'price': int(price_digits),
+        **ad,
+        'address': _text(address.group(1)),
+        'description': description_text,
+    }
+
+
+def extract_fast(content: str) -> dict | None:
+    """Pull the ad fields straight from the itemprop markers without building a DOM.
+
+    Returns None when any of the markers is missing or malformed, so the caller can
+    fall back to the full BeautifulSoup parse.
+    """
+    title = _TITLE_PATTERN.search(content)
+    price = _PRICE_PATTERN.search(content)
+    address = _ADDRESS_PATTERN.search(content)
+    description = _DESCRIPTION_PATTERN.search(content)
+    if not (title and price and address and description):
+        return None
+    return _build(title, price, address, description)
+
+
+# field -> (marker, opening tag, closing tag, pattern anchored at the opening tag)
+_STREAM_FIELDS = {
+    'title': ('itemprop="name"', '<h1', '</h1>', _TITLE_PATTERN),
+    'price': ('itemprop="price"', '<span', '</span>', _PRICE_PATTERN),
+    'address': ('itemprop="address"', '<div', '</span>', _ADDRESS_PATTERN),
+    'description': ('itemprop="description"', '<div', '</div>', _DESCRIPTION_PATTERN),
+}
+# enough of the previous chunk to notice a marker or closing tag split between chunks
+_STREAM_OVERLAP = max(len(text) for marker, _, closing, _ in _STREAM_FIELDS.values() for text in (marker, closing)) - 1
+
+
+class StreamingExtractor:
+    """Incremental version of extract_fast for a page that arrives in chunks.
+
+    ``feed`` returns the ad as soon as all fields have been seen, so the caller can stop
+    reading the body. Chunks are only collected in a list; the page is joined and scanned
+    again only when a chunk brings a marker or a closing tag one of the missing fields needs.
+    """
+
+    def __init__(self):
+        self._chunks: list[str] = []
+        self._content = ''
+        self._joined = 0
+        self._tail = ''
+        self._positions = {field: 0 for field in _STREAM_FIELDS}
+        self._matches: dict[str, re.Match] = {}
+        self._waiting: set[str] = set()
+        self.failed = False
+
+    @property
+    def content(self) -> str:
+        if self._joined != len(self._chunks):
+            self._content = ''.join(self._chunks)
+            self._joined = len(self._chunks)
+        return self._content
+
+    def _scan(self, field: str) -> re.Match | None:
+        marker, tag, _, pattern = _STREAM_FIELDS[field]
+        content = self.content
+        while True:
+            position = content.find(marker, self._positions[field])
+            if position == -1:
+                # keep enough of the tail to find a marker split between chunks
+                self._positions[field] = max(len(content) - len(marker), self._positions[field])
+                return None
+            tag_start = content.rfind('<', 0, position)
+            if tag_start != -1 and content.startswith(tag, tag_start):
+                self._positions[field] = position
+                # None here means the element is not closed yet, wait for more data
+                self._waiting.add(field)
+                return pattern.match(content, tag_start)
+            self._positions[field] = position + len(marker)
+
+    def _needs_scan(self, window: str) -> bool:
+        for field, (marker, _, closing, _) in _STREAM_FIELDS.items():
+            if field in self._matches:
+                continue
+            if marker in window or (field in self._waiting and closing in window):
+                return True
+        return False
+
+    def feed(self, chunk: str) -> dict | None:
+        self._chunks.append(chunk)
+        window = self._tail + chunk
+        self._tail = window[-_STREAM_OVERLAP:]
+        if self.failed or not self._needs_scan(window):
+            return None
+        for field in _STREAM_FIELDS:
+            if field not in self._matches:
+                match = self._scan(field)
+                if match is not None:
+                    self._matches[field] = match
+        if len(self._matches) < len(_STREAM_FIELDS):
+            return None
+        ad = _build(**self._matches)
+        if ad is None:
+            self.failed = True
+        return ad
@@ -1,5 +1,13 @@
-from httpx import AsyncClient
+from dataclasses import replace
+from httpx import HTTPError, Response, TransportError
 from bs4 import BeautifulSoup
+from .client import AvitoClient, get_client
+from .exceptions import AdvertisementNotFound, AvitoScrapingException, AvitoUnavailable, TooManyRequests
+from .workers import ParserPool, get_pool
+from .extractor import StreamingExtractor, extract_fast, parse_title
+from .cache import CacheEntry, ResultCache, get_cache
+from .singleflight import SingleFlight
+from .urls import extract_item_id
 from .types import Result
 import asyncio
 import logging
@@ -9,32 +17,14 @@ import re
 logger = logging.getLogger(__name__)
 
 
-class AvitoScrapingException(Exception):
-    pass
+_in_flight: SingleFlight[Result] = SingleFlight()
 
 
-class TooManyRequests(AvitoScrapingException):
-    pass
-
-
-async def scrape_content(content: str) -> dict:
-    area_pattern = r'(\d+(?:[.,]\d+)?)\s*м²'
-    rooms_pattern = r'(\d+)\s*-\s*к\.'
-    floor_pattern = r'(\d+)\s*/\s*(\d+)\s*эт\.'
-
+def parse_content_soup(content: str) -> dict:
     soup = BeautifulSoup(content, 'html.parser')
 
     title = soup.find('h1', itemprop='name').text
-
-    room_area = re.search(area_pattern, title).group(1)
-    room_area = float(room_area.replace(',', '.'))
-
-    number_of_rooms_in_flat = re.search(rooms_pattern, title).group(1)
-    number_of_rooms_in_flat = int(number_of_rooms_in_flat)
-
-    flour, flours_in_building = re.search(floor_pattern, title).groups()
-    flour = int(flour)
-    flours_in_building = int(flours_in_building)
+    ad = parse_title(title)
 
     price = soup.find('span', itemprop='price').text
     price = int(re.sub(r'\D', '', price))
@@ -48,73 +38,147 @@ async def scrape_content(content: str) -> dict:
 
     return {
         'price': price,
-        'room_area': room_area,
-        'number_of_rooms_in_flat': number_of_rooms_in_flat,
-        'flour': flour,
-        'flours_in_building': flours_in_building,
+        **ad,
         'address': address,
         'description': description_text,
     }
 
 
-async def make_requests(urls: list[str]) -> list[str]:
-    headers = {
-        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) '
-                      'AppleWebKit/537.36 (KHTML, like Gecko) '
-                      'Chrome/58.0.3029.110 Safari/537.3'
-    }
-
-    results = []
-
-    async with AsyncClient() as client:
-        for url in urls:
-            response = await client.get(url, headers=headers)
-
+def parse_content(content: str) -> dict:
+    ad = extract_fast(content)
+    if ad is None:
+        logger.info("Fast extraction missed, falling back to full page parse")
+        ad = parse_content_soup(content)
+    return ad
+
+
+async def scrape_content(content: str, pool: ParserPool | None = None) -> dict:
+    pool = pool or get_pool()
+    return await pool.run(parse_content, content)
+
+
+async def scrape_avito_room_ad(
+        url: str,
+        client: AvitoClient | None = None,
+        cache: ResultCache | None = None,
+        retry: bool = True,
+) -> Result | None:
+    """Scrape one room ad, answering from the cache or revalidating it when possible.
+
+    Interactive callers pass ``retry=False``: waiting out a 429 backoff takes longer than
+    a user should wait, so the 429 is reported right away.
+    """
+    client = client or get_client()
+    cache = cache if cache is not None else get_cache()
+    key = extract_item_id(url) or url
+
+    entry = cache.get(key)
+    if entry is not None and entry.is_fresh:
+        logger.info(f"Cache hit for {url}")
+        return replace(entry.result, url=url)
+
+    result = await _in_flight.do(key, lambda: _fetch_avito_room_ad(url, key, entry, client, cache, retry))
+    return replace(result, url=url)
+
+
+async def _read_ad(url: str, response: Response, streaming: bool) -> dict:
+    if streaming:
+        extractor = StreamingExtractor()
+        ad = None
+        async for chunk in response.aiter_text():
+            if ad is not None:
+                continue
+            ad = extractor.feed(chunk)
+            if ad is not None:
+                logger.info(f"Got all fields of {url} after {response.num_bytes_downloaded} bytes")
+                # closing an HTTP/1.1 response before its end drops the connection instead of
+                # returning it to the pool, so there the rest of the body is read and discarded
+                if response.http_version == 'HTTP/2':
+                    return ad
+        if ad is not None:
+            return ad
+        content = extractor.content
+    else:
+        await response.aread()
+        content = response.text
+
+    try:
+        return await scrape_content(content)
+    except (AttributeError, TypeError, ValueError) as e:
+        text = f"Unable to parse advertisement page {url}: {e!r}"
+        logger.error(text)
+        raise AvitoScrapingException(text) from e
+
+
+async def _fetch_avito_room_ad(
+        url: str,
+        key: int | str,
+        entry: CacheEntry | None,
+        client: AvitoClient,
+        cache: ResultCache,
+        retry: bool = True,
+) -> Result:
+    headers = entry.conditional_headers() if entry is not None else {}
+
+    try:
+        async with client.stream(url, headers=headers, retry=retry) as response:
             if response.status_code == 200:
                 logger.info(f"Successfully fetched {url}")
-                results.append(response.text)
+                ad = await _read_ad(url, response, client.streaming)
             else:
-                logger.error(f"Error {response.status_code} while fetching {url}\n"
-                             f"Response: {response.text}")
+                await response.aread()
+    except TransportError as e:
+        text = f"Network error while fetching {url}: {e!r}"
+        logger.error(text)
+        raise AvitoUnavailable(text) from e
+    except HTTPError as e:
+        text = f"HTTP error while fetching {url}: {e!r}"
+        logger.error(text)
+        raise AvitoScrapingException(text) from e
+
+    if response.status_code == 304 and entry is not None:
+        logger.info(f"Not modified since last fetch {url}")
+        cache.touch(key)
+        return entry.result
+    elif response.status_code == 200:
+        result = Result(
+            url=url,
+            item_id=extract_item_id(url),
+            **ad
+        )
+        cache.set(
+            key,
+            result,
+            etag=response.headers.get('ETag'),
+            last_modified=response.headers.get('Last-Modified'),
+        )
+        return result
+    elif response.status_code == 429:
+        text = f"Too many requests. Avito blocks request to {url}"
+        logger.error(text)
+        raise TooManyRequests(text)
+    elif response.status_code in (404, 410):
+        text = f"Advertisement {url} not found (status {response.status_code})"
+        logger.warning(text)
+        raise AdvertisementNotFound(text)
+    elif response.status_code >= 500:
+        text = f"Avito is unavailable, error {response.status_code} while fetching {url}"
+        logger.error(text)
+        raise AvitoUnavailable(text)
+    else:
+        text = (f"Error {response.status_code} while fetching {url}\n"
+                f"Response: {response.text}")
+        logger.error(text)
+        raise AvitoScrapingException(text)
 
-    return results
 
-
-async def scrape_avito_room_ad(url: str) -> Result | None:
-
-    headers = {
-        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) '
-                      'AppleWebKit/537.36 (KHTML, like Gecko) Chrome/58.0.3029.110 Safari/537.3',
-        'Referer': 'https://web.telegram.org/',
-        'Accept-Language': 'da, en-gb, en',
-        'Accept-Encoding': 'gzip, deflate, br',
-        'Accept': 'text / html, application / xhtml + xml, application / xml; '
-        'q = 0.9, image / avif, image / webp, * / *;q = 0.8'
-
-    }
-
-    async with AsyncClient() as client:
-        response = await client.get(url, headers=headers, follow_redirects=True)
-
-        if response.status_code == 200:
-            logger.info(f"Successfully fetched {url}")
-            ad = await scrape_content(response.text)
-            result = Result(
-                url=url,
-                **ad
+if __name__ == '__main__':
+    async def _main():
+        async with AvitoClient() as client:
+            await scrape_avito_room_ad(
+                'https://www.avito.ru/sankt-peterburg/komnaty/komnata_26m_v_4-k._25et._3179086012',
+                client=client,
             )
-            return result
-        elif response.status_code == 429:
-            text = f"Too many requests. Avito blocks request to {url}"
-            logger.error(text)
-            raise TooManyRequests(text)
-        else:
-            text = (f"Error {response.status_code} while fetching {url}\n"
-                    f"Response: {response.text}")
-            logger.error(text)
-            raise AvitoScrapingException(text)
 
-
-if __name__ == '__main__':
     logging.basicConfig(level=logging.INFO)
-    asyncio.run(scrape_avito_room_ad('https://www.avito.ru/sankt-peterburg/komnaty/komnata_26m_v_4-k._25et._3179086012'))
+    asyncio.run(_main())
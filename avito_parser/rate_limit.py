@@ -0,0 +1,144 @@
+from email.utils import parsedate_to_datetime
+from datetime import datetime, timezone
+from urllib.parse import urlsplit
+from .exceptions import RateLimitExceeded
+import asyncio
+import logging
+import time
+
+
+logger = logging.getLogger(__name__)
+
+
+def parse_retry_after(value: str | None) -> float | None:
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        moment = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    return max((moment - datetime.now(timezone.utc)).total_seconds(), 0.0)
+
+
+class TokenBucket:
+    """Token bucket whose refill rate adapts to the server's reaction.
+
+    Every 429 halves the rate (down to ``min_rate``) and blocks the bucket for the
+    Retry-After period, every successful response raises it back by ``increase_step``
+    up to ``max_rate``. Callers wait in FIFO order. A caller that would have to wait longer
+    than its ``max_wait`` gets RateLimitExceeded at once.
+    """
+
+    def __init__(
+            self,
+            max_rate: float,
+            burst: int,
+            min_rate: float,
+            increase_step: float,
+            default_backoff: float,
+    ):
+        self.max_rate = max_rate
+        self.min_rate = min_rate
+        self.rate = max_rate
+        self.burst = burst
+        self.increase_step = increase_step
+        self.default_backoff = default_backoff
+        self._tokens = float(burst)
+        self._updated_at = time.monotonic()
+        self._blocked_until = 0.0
+
+    def _refill(self, now: float):
+        self._tokens = min(self.burst, self._tokens + (now - self._updated_at) * self.rate)
+        self._updated_at = now
+
+    async def acquire(self, max_wait: float):
+        deadline = time.monotonic() + max_wait
+        while True:
+            now = time.monotonic()
+            if now < self._blocked_until:
+                if self._blocked_until > deadline:
+                    raise RateLimitExceeded(f"Rate limit backoff of {self._blocked_until - now:.1f}s "
+                                            f"exceeds {max_wait}s")
+                await asyncio.sleep(self._blocked_until - now)
+                continue
+
+            self._refill(now)
+            # the token is reserved before sleeping (the balance may go negative), so waiters
+            # are served in arrival order without holding a lock while they sleep
+            wait = max(0.0, (1 - self._tokens) / self.rate)
+            if now + wait > deadline:
+                raise RateLimitExceeded(f"Rate limit wait of {wait:.1f}s exceeds {max_wait}s")
+            self._tokens -= 1
+            if wait == 0:
+                return
+            try:
+                await asyncio.sleep(wait)
+            except asyncio.CancelledError:
+                # give the reserved slot back so the callers behind are not delayed by it
+                self._tokens += 1
+                raise
+            # a 429 that arrived meanwhile voids the reservation, wait for the backoff instead
+            if time.monotonic() >= self._blocked_until:
+                return
+
+    def on_success(self):
+        self.rate = min(self.max_rate, self.rate + self.increase_step)
+
+    def on_too_many_requests(self, retry_after: float | None):
+        now = time.monotonic()
+        self.rate = max(self.min_rate, self.rate / 2)
+        self._tokens = 0.0
+        self._updated_at = now
+        self._blocked_until = max(self._blocked_until, now + (retry_after or self.default_backoff))
+        logger.warning(f"Got 429, slowing down to {self.rate:.2f} req/s "
+                       f"and pausing for {self._blocked_until - now:.1f}s")
+
+
+class RateLimiter:
+    """Keeps one adaptive token bucket per host."""
+
+    def __init__(
+            self,
+            rate: float = 1.0,
+            burst: int = 5,
+            min_rate: float = 0.1,
+            increase_step: float = 0.05,
+            default_backoff: float = 30.0,
+            max_wait: float = 10.0,
+    ):
+        self.rate = rate
+        self.burst = burst
+        self.min_rate = min_rate
+        self.increase_step = increase_step
+        self.default_backoff = default_backoff
+        self.max_wait = max_wait
+        self._buckets: dict[str, TokenBucket] = {}
+
+    def bucket(self, url: str) -> TokenBucket:
+        host = urlsplit(url).hostname or ''
+        bucket = self._buckets.get(host)
+        if bucket is None:
+            bucket = TokenBucket(
+                max_rate=self.rate,
+                burst=self.burst,
+                min_rate=self.min_rate,
+                increase_step=self.increase_step,
+                default_backoff=self.default_backoff,
+            )
+            self._buckets[host] = bucket
+        return bucket
+
+    async def acquire(self, url: str, max_wait: float | None = None):
+        await self.bucket(url).acquire(self.max_wait if max_wait is None else max_wait)
+
+    def feedback(self, url: str, status_code: int, retry_after: str | None = None):
+        bucket = self.bucket(url)
+        if status_code == 429:
+            bucket.on_too_many_requests(parse_retry_after(retry_after))
+        elif status_code < 500:
+            bucket.on_success()
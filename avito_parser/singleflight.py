@@ -0,0 +1,28 @@
+from typing import Awaitable, Callable, Generic, Hashable, TypeVar
+import asyncio
+
+
+T = TypeVar('T')
+
+
+class SingleFlight(Generic[T]):
+    """Collapses concurrent calls with the same key into one in-flight task.
+
+    Every caller awaiting a key gets the result (or the exception) of the single
+    task started by the first caller. Cancelling one caller does not cancel the
+    shared task for the others.
+    """
+
+    def __init__(self):
+        self._tasks: dict[Hashable, asyncio.Task[T]] = {}
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._tasks
+
+    async def do(self, key: Hashable, func: Callable[[], Awaitable[T]]) -> T:
+        task = self._tasks.get(key)
+        if task is None:
+            task = asyncio.ensure_future(func())
+            self._tasks[key] = task
+            task.add_done_callback(lambda _: self._tasks.pop(key, None))
+        return await asyncio.shield(task)
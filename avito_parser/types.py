@@ -12,3 +12,4 @@ class Result:
     flours_in_building: int
     address: str
     description: str
+    item_id: Optional[int] = None
@@ -0,0 +1,14 @@
+from urllib.parse import urlsplit
+import re
+
+
+_ITEM_ID_PATTERN = re.compile(r'_(\d+)$')
+
+
+def extract_item_id(url: str) -> int | None:
+    """Return the numeric Avito item id from an ad url (the trailing ``_<digits>`` of the path)."""
+    path = urlsplit(url).path.rstrip('/')
+    match = _ITEM_ID_PATTERN.search(path)
+    if not match:
+        return None
+    return int(match.group(1))
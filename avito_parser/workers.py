@@ -0,0 +1,78 @@
+from concurrent.futures import Executor, ThreadPoolExecutor, ProcessPoolExecutor
+from typing import Callable, TypeVar
+import asyncio
+import logging
+
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar('T')
+
+MODES = ('inline', 'thread', 'process')
+
+
+class ParserPool:
+    """Runs CPU-bound page parsing outside of the event loop.
+
+    ``inline`` mode runs the function directly in the calling coroutine and is meant for tests.
+    At most ``max_workers + max_queue`` jobs are admitted at once, the rest wait for a free slot.
+    """
+
+    def __init__(self, mode: str = 'thread', max_workers: int = 2, max_queue: int = 16):
+        if mode not in MODES:
+            raise ValueError(f"Unknown parser pool mode: {mode}")
+        self.mode = mode
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self._slots = asyncio.Semaphore(max_workers + max_queue)
+        self._executor: Executor | None = None
+
+    def start(self):
+        if self.mode == 'inline' or self._executor is not None:
+            return
+        if self.mode == 'process':
+            self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+        else:
+            self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='avito-parser')
+        logger.info(f"Parser pool started ({self.mode}, {self.max_workers} workers)")
+
+    def close(self):
+        if self._executor is None:
+            return
+        self._executor.shutdown(wait=True, cancel_futures=True)
+        self._executor = None
+        logger.info("Parser pool closed")
+
+    async def run(self, func: Callable[..., T], *args) -> T:
+        if self.mode == 'inline':
+            return func(*args)
+        if self._executor is None:
+            self.start()
+        async with self._slots:
+            return await asyncio.get_running_loop().run_in_executor(self._executor, func, *args)
+
+
+_pool: ParserPool | None = None
+
+
+def get_pool() -> ParserPool:
+    global _pool
+    if _pool is None:
+        _pool = ParserPool()
+    return _pool
+
+
+def init_pool(**kwargs) -> ParserPool:
+    global _pool
+    if _pool is not None:
+        _pool.close()
+    _pool = ParserPool(**kwargs)
+    _pool.start()
+    return _pool
+
+
+def close_pool():
+    global _pool
+    if _pool is not None:
+        _pool.close()
+        _pool = None
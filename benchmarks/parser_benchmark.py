@@ -0,0 +1,211 @@
+"""Offline benchmark for the Avito page parser.
+
+Runs every parser engine over the pages in ``benchmarks/fixtures/avito``, checks the
+output against ``expected.json`` and compares timing, allocations and peak memory with
+the stored baseline. Timings are compared as ratios to a fixed reference workload timed
+right before every run, so a baseline stored on one machine holds on another.
+
+    python -m benchmarks.parser_benchmark                    # compare with baseline
+    python -m benchmarks.parser_benchmark --update-baseline  # store current numbers
+"""
+from html.parser import HTMLParser
+from pathlib import Path
+from statistics import median
+from typing import Callable
+from avito_parser.extractor import StreamingExtractor, extract_fast
+from avito_parser.parser import parse_content, parse_content_soup
+import argparse
+import gc
+import json
+import sys
+import time
+import tracemalloc
+
+
+FIXTURES_DIR = Path(__file__).parent / 'fixtures' / 'avito'
+EXPECTED_FILE = FIXTURES_DIR / 'expected.json'
+BASELINE_FILE = Path(__file__).parent / 'parser_baseline.json'
+REFERENCE_PAGE = FIXTURES_DIR / 'small.html'
+
+# httpcore reads the socket 64 KiB at a time, so streamed pages arrive in chunks of about this size
+STREAM_CHUNK_SIZE = 64 * 1024
+
+
+def extract_streaming(content: str) -> dict | None:
+    """What _read_ad does with a streamed response: feed chunks, fall back to the full parse."""
+    extractor = StreamingExtractor()
+    for start in range(0, len(content), STREAM_CHUNK_SIZE):
+        ad = extractor.feed(content[start:start + STREAM_CHUNK_SIZE])
+        if ad is not None:
+            return ad
+    return parse_content(extractor.content)
+
+
+ENGINES: dict[str, Callable[[str], dict | None]] = {
+    'fast': extract_fast,
+    'soup': parse_content_soup,
+    'auto': parse_content,
+    'stream': extract_streaming,
+}
+
+# Differences below these are noise rather than regressions.
+MIN_TIME_DELTA_MS = 0.5
+MIN_MEMORY_DELTA_KIB = 64
+
+_TRACEMALLOC_FILTER = tracemalloc.Filter(False, tracemalloc.__file__)
+
+
+def run_engine(engine: Callable[[str], dict | None], content: str) -> dict | None:
+    try:
+        return engine(content)
+    except (AttributeError, TypeError, ValueError):
+        return None
+
+
+def reference_workload(content: str):
+    # plain stdlib work whose speed follows the machine, not the code under test
+    parser = HTMLParser()
+    parser.feed(content)
+    parser.close()
+
+
+def elapsed_ms(func: Callable[[], object]) -> float:
+    started = time.perf_counter()
+    func()
+    return (time.perf_counter() - started) * 1000
+
+
+def measure(engine: Callable[[str], dict | None], content: str, repeat: int, reference: str) -> dict:
+    timings = []
+    ratios = []
+    reference_timings = []
+    for _ in range(repeat):
+        # every run is paired with a reference run right before it, so a machine that
+        # speeds up or slows down during the benchmark shifts both sides of the ratio
+        reference_ms = elapsed_ms(lambda: reference_workload(reference))
+        engine_ms = elapsed_ms(lambda: run_engine(engine, content))
+        reference_timings.append(reference_ms)
+        timings.append(engine_ms)
+        ratios.append(engine_ms / reference_ms)
+
+    # with the gc off the snapshot diff is deterministic: the result plus every object
+    # reference counting could not free (the cyclic garbage the gc would collect later)
+    gc.collect()
+    gc.disable()
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot().filter_traces([_TRACEMALLOC_FILTER])
+    tracemalloc.reset_peak()
+    output = run_engine(engine, content)
+    _, peak = tracemalloc.get_traced_memory()
+    after = tracemalloc.take_snapshot().filter_traces([_TRACEMALLOC_FILTER])
+    tracemalloc.stop()
+    gc.enable()
+    del output
+    allocations = [stat for stat in after.compare_to(before, 'filename') if stat.size_diff > 0]
+
+    return {
+        'median_ms': round(median(timings), 3),
+        'min_ms': round(min(timings), 3),
+        'reference_ms': round(median(reference_timings), 3),
+        'relative': round(median(ratios), 3),
+        'peak_kib': round(peak / 1024, 1),
+        'alloc_kib': round(sum(stat.size_diff for stat in allocations) / 1024, 1),
+        'alloc_blocks': sum(stat.count_diff for stat in allocations),
+    }
+
+
+def check_output(page: str, engine_name: str, output: dict | None, expected: dict | None) -> str | None:
+    if engine_name == 'fast' and output is None:
+        # the fast path is allowed to miss, parse_content falls back to soup then
+        return None
+    if output != expected:
+        return f"{page} [{engine_name}]: got {output!r}, expected {expected!r}"
+    return None
+
+
+def run(repeat: int) -> tuple[dict, list[str]]:
+    expected = json.loads(EXPECTED_FILE.read_text(encoding='utf-8'))
+    reference = REFERENCE_PAGE.read_text(encoding='utf-8')
+    results = {}
+    errors = []
+    for page in sorted(expected):
+        content = (FIXTURES_DIR / page).read_text(encoding='utf-8')
+        results[page] = {'size_kib': round(len(content.encode()) / 1024, 1)}
+        for engine_name, engine in ENGINES.items():
+            error = check_output(page, engine_name, run_engine(engine, content), expected[page])
+            if error:
+                errors.append(error)
+            results[page][engine_name] = measure(engine, content, repeat, reference)
+    return results, errors
+
+
+def compare(results: dict, baseline: dict, time_tolerance: float, memory_tolerance: float) -> list[str]:
+    regressions = []
+    for page, engines in results.items():
+        for engine_name, current in engines.items():
+            previous = baseline.get(page, {}).get(engine_name)
+            if not isinstance(current, dict) or not previous:
+                continue
+            # the absolute noise floor is converted with this run's reference speed
+            min_relative_delta = MIN_TIME_DELTA_MS / current['reference_ms']
+            time_limit = max(previous['relative'] * (1 + time_tolerance), previous['relative'] + min_relative_delta)
+            if current['relative'] > time_limit:
+                regressions.append(f"{page} [{engine_name}]: {current['relative']}x reference "
+                                   f"vs baseline {previous['relative']}x")
+            for key, unit in (('peak_kib', 'KiB peak'), ('alloc_kib', 'KiB allocated')):
+                memory_limit = max(previous[key] * (1 + memory_tolerance), previous[key] + MIN_MEMORY_DELTA_KIB)
+                if current[key] > memory_limit:
+                    regressions.append(f"{page} [{engine_name}]: {current[key]}{unit} "
+                                       f"vs baseline {previous[key]}{unit}")
+    return regressions
+
+
+def print_report(results: dict):
+    print(f"{'page':<28}{'KiB':>8}  {'engine':<6}{'median ms':>11}{'min ms':>9}{'x ref':>8}"
+          f"{'peak KiB':>10}{'alloc KiB':>11}{'blocks':>8}")
+    for page, engines in results.items():
+        for engine_name in ENGINES:
+            stats = engines[engine_name]
+            print(f"{page:<28}{engines['size_kib']:>8}  {engine_name:<6}"
+                  f"{stats['median_ms']:>11}{stats['min_ms']:>9}{stats['relative']:>8}"
+                  f"{stats['peak_kib']:>10}{stats['alloc_kib']:>11}{stats['alloc_blocks']:>8}")
+
+
+def main() -> int:
+    arg_parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    arg_parser.add_argument('--repeat', type=int, default=20)
+    arg_parser.add_argument('--time-tolerance', type=float, default=0.5)
+    arg_parser.add_argument('--memory-tolerance', type=float, default=0.2)
+    arg_parser.add_argument('--update-baseline', action='store_true')
+    args = arg_parser.parse_args()
+
+    results, errors = run(args.repeat)
+    print_report(results)
+
+    for error in errors:
+        print(f"WRONG OUTPUT: {error}", file=sys.stderr)
+    if errors:
+        return 1
+
+    if args.update_baseline:
+        BASELINE_FILE.write_text(json.dumps(results, indent=4) + '\n', encoding='utf-8')
+        print(f"Baseline written to {BASELINE_FILE}")
+        return 0
+
+    if not BASELINE_FILE.exists():
+        print("No baseline stored yet, run with --update-baseline", file=sys.stderr)
+        return 0
+
+    regressions = compare(
+        results,
+        json.loads(BASELINE_FILE.read_text(encoding='utf-8')),
+        args.time_tolerance,
+        args.memory_tolerance,
+    )
+    for regression in regressions:
+        print(f"REGRESSION: {regression}", file=sys.stderr)
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -9,6 +9,66 @@ class Settings(BaseSettings):
     db_url: SecretStr
     postgres_password: SecretStr
 
+    # below dadata_deadline, which also covers the address cache lookup
+    dadata_timeout: float = 2.5
+    dadata_max_connections: int = 5
+    dadata_cache_size: int = 4096
+    dadata_cache_ttl: int = 30 * 24 * 3600
+    dadata_request_cost: float = 0.15
+    dadata_deadline: float = 3.0
+
+    avito_max_connections: int = 10
+    avito_max_keepalive_connections: int = 5
+    avito_keepalive_expiry: float = 30.0
+    avito_timeout: float = 10.0
+    avito_http2: bool = False
+    avito_max_concurrency: int = 10
+    avito_parser_mode: str = 'thread'
+    avito_parser_workers: int = 2
+    avito_parser_queue_size: int = 16
+    avito_cache_size: int = 1024
+    avito_cache_ttl: float = 600.0
+    avito_rate_limit: float = 1.0
+    avito_rate_burst: int = 5
+    avito_rate_min: float = 0.1
+    avito_rate_max_wait: float = 10.0
+    avito_max_retries: int = 1
+    avito_retry_max_wait: float = 60.0
+    avito_streaming: bool = True
+    avito_deadline: float = 20.0
+    # requests in flight per background job, keep it well below avito_rate_limit * avito_rate_max_wait
+    avito_background_concurrency: int = 2
+
+    db_echo: bool = False
+    db_pool_size: int = 5
+    db_max_overflow: int = 10
+    db_pool_timeout: float = 30.0
+    db_pool_recycle: int = 1800
+    db_pool_pre_ping: bool = True
+    db_statement_cache_size: int = 100
+    db_pgbouncer: bool = False
+    db_metrics_interval: int = 300
+
+    user_cache_size: int = 1024
+    user_cache_ttl: float = 600.0
+
+    breaker_failure_threshold: int = 5
+    breaker_recovery_timeout: float = 30.0
+
+    avito_search_url: str | None = None
+    avito_crawl_interval: int = 3600
+    avito_crawl_max_pages: int = 5
+
+    nearby_limit: int = 5
+    metro_stations_limit: int = 3
+    metro_search_distance: float = 1.0
+    room_location_backfill_enabled: bool = True
+
+    price_monitor_enabled: bool = True
+    price_monitor_hour: int = 4
+    price_monitor_batch_size: int = 200
+    price_monitor_cache_size: int = 10000
+
     class Config:
         env_file = '.env'
         env_file_encoding = 'utf-8'
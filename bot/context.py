@@ -0,0 +1,22 @@
+from telegram.ext import CallbackContext, ExtBot
+from sqlalchemy.ext.asyncio import AsyncSession
+
+
+class BotContext(CallbackContext[ExtBot, dict, dict, dict]):
+    """Callback context with the update's database session set up by SessionMiddleware."""
+
+    @property
+    def session(self) -> AsyncSession:
+        try:
+            provider = self.__getattribute__('session_provider')
+        except AttributeError:
+            raise AttributeError('session') from None
+        return provider.session
+
+    async def release_session(self):
+        """Give the session's connection back to the pool before slow external I/O."""
+        try:
+            provider = self.__getattribute__('session_provider')
+        except AttributeError:
+            return
+        await provider.release()
@@ -0,0 +1,90 @@
+from telegram import Update
+from telegram.ext import ContextTypes
+from avito_parser import extract_item_id
+from bot.config import config
+from bot.service import advertisement as advertisement_service
+from bot.utils.breakers import dadata_breaker
+from bot.utils.circuit_breaker import CircuitBreakerError
+from bot.utils.dadata_repository import dadata, DadataException
+from logging import getLogger
+import html
+
+from .static_text import (NEARBY_USAGE_TEXT, NEARBY_NO_LOCATION_TEXT, NEARBY_NOT_FOUND_TEXT, NEARBY_ITEM_TEMPLATE,
+                          METRO_USAGE_TEXT, METRO_NOT_FOUND_TEXT)
+
+
+logger = getLogger(__name__)
+
+
+async def nearby(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    query = ' '.join(context.args or [])
+    if not query:
+        await update.message.reply_text(NEARBY_USAGE_TEXT)
+        return
+
+    session = context.session
+    lat = lon = exclude_id = None
+
+    if query.isdigit() or 'avito.ru' in query:
+        if query.isdigit():
+            advertisement = await advertisement_service.get_advertisement(session, int(query))
+        else:
+            item_id = extract_item_id(query)
+            advertisement = item_id and await advertisement_service.get_advertisement_by_item_id(session, item_id)
+        if advertisement:
+            lat, lon = advertisement.room.geo_lat, advertisement.room.geo_lon
+            exclude_id = advertisement.id
+    else:
+        try:
+            address = await dadata_breaker.call(lambda: dadata.get_clean_data(query))
+        except (DadataException, CircuitBreakerError) as e:
+            logger.error(e)
+        else:
+            lat, lon = address.geo_lat, address.geo_lon
+
+    if lat is None or lon is None:
+        await update.message.reply_text(NEARBY_NO_LOCATION_TEXT)
+        return
+
+    nearest = await advertisement_service.get_nearby_advertisements(
+        session, lat, lon, limit=config.nearby_limit, exclude_id=exclude_id,
+    )
+    await context.release_session()
+    if not nearest:
+        await update.message.reply_text(NEARBY_NOT_FOUND_TEXT)
+        return
+    await reply_with_advertisements(update, nearest)
+
+
+async def metro(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    args = list(context.args or [])
+    max_distance = config.metro_search_distance
+    if args:
+        try:
+            max_distance = float(args[-1].replace(',', '.'))
+            args = args[:-1]
+        except ValueError:
+            pass
+    if not args:
+        await update.message.reply_text(METRO_USAGE_TEXT)
+        return
+
+    nearest = await advertisement_service.get_advertisements_near_station(context.session, ' '.join(args), max_distance)
+    await context.release_session()
+    if not nearest:
+        await update.message.reply_text(METRO_NOT_FOUND_TEXT)
+        return
+    await reply_with_advertisements(update, nearest)
+
+
+async def reply_with_advertisements(update: Update, nearest: list):
+    lines = [
+        NEARBY_ITEM_TEMPLATE.format(
+            distance=distance,
+            address=html.escape(advertisement.room.address or ''),
+            price=advertisement.price // 1000,
+            url=html.escape(advertisement.url),
+        )
+        for advertisement, distance in nearest
+    ]
+    await update.message.reply_text('\n'.join(lines), parse_mode='HTML', disable_web_page_preview=True)
@@ -0,0 +1,13 @@
+NEARBY_USAGE_TEXT = """Укажите адрес, ссылку на объявление или его номер:
+/nearby Невский проспект 100"""
+
+NEARBY_NO_LOCATION_TEXT = 'Не удалось определить координаты'
+
+NEARBY_NOT_FOUND_TEXT = 'Рядом нет активных объявлений'
+
+METRO_USAGE_TEXT = """Укажите станцию метро и, при желании, расстояние в км:
+/metro Технологический институт 1.5"""
+
+METRO_NOT_FOUND_TEXT = 'Рядом со станцией нет активных объявлений'
+
+NEARBY_ITEM_TEMPLATE = '{distance:.1f} км — {address}, {price}тр <a href="{url}">АВИТО</a>'
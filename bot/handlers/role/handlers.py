@@ -1,7 +1,7 @@
 from telegram import Update
 from telegram.ext import ContextTypes, ConversationHandler
 from .manage_data import AddRoleConversationSteps
-from database.models import User
+from bot.utils.user_cache import UserIdentity
 from database.enums import UserRole
 from bot.service import user as user_service
 from .keyboards import get_roles_keyboard
@@ -9,7 +9,7 @@ from .keyboards import get_roles_keyboard
 
 async def start_give_role(update: Update, context: ContextTypes.DEFAULT_TYPE):
     try:
-        user: User = context.database_user
+        user: UserIdentity = context.database_user
     except AttributeError:
         raise Exception('User is not in context')
 
@@ -58,7 +58,7 @@ async def save_role(update: Update, context: ContextTypes.DEFAULT_TYPE):
         raise Exception('Session is not in context')
 
     try:
-        user: User = context.database_user
+        user: UserIdentity = context.database_user
     except AttributeError:
         raise Exception('User is not in context')
 
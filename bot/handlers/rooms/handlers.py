@@ -1,14 +1,19 @@
 from telegram import Update, Bot, Message, ReplyKeyboardMarkup, InlineKeyboardMarkup
 from telegram.ext import ContextTypes
 from telegram.ext import ConversationHandler
-from avito_parser import scrape_avito_room_ad,TooManyRequests, AvitoScrapingException
-from database.types import RoomInfoCreate, DataToGather, RoomCreate, AdvertisementCreate, AdvertisementResponse
+from avito_parser import (scrape_avito_room_ad, extract_item_id, TooManyRequests, RateLimitExceeded,
+                          AvitoScrapingException)
+from database.types import (RoomInfoCreate, DataToGather, RoomCreate, AdvertisementCreate, AdvertisementResponse,
+                            MetroStation)
 from database.enums import AdvertisementStatus, EntranceType, ViewType, ToiletType, RoomType
-from bot.utils.dadata_repository import dadata
+from bot.config import config
+from bot.utils.dadata_address import DadataAddress
+from bot.utils.dadata_repository import dadata, DadataException
+from bot.utils.circuit_breaker import CircuitBreakerError, DeadlineExceeded
+from bot.utils.breakers import avito_breaker, dadata_breaker
 from bot.service import user as user_service
-from bot.service import room as room_service
-from bot.service import room_info as room_info_service
 from bot.service import advertisement as advertisement_service
+from bot.service import submission as submission_service
 
 
 from typing import Optional
@@ -85,6 +90,53 @@ async def delete_messages(context: ContextTypes.DEFAULT_TYPE):
     context.user_data["messages_to_delete"] = []
 
 
+def get_metro_stations(address: DadataAddress) -> list[MetroStation]:
+    stations = [
+        MetroStation.model_validate(station) for station in address.metro or []
+        if station.get('name') and station.get('distance') is not None
+    ]
+    return sorted(stations, key=lambda station: station.distance)[:config.metro_stations_limit]
+
+
+async def prefetch_house_address(data: DataToGather):
+    try:
+        address = await dadata_breaker.call(lambda: dadata.get_clean_data(data.address))
+    except (DadataException, CircuitBreakerError) as e:
+        logger.error(e)
+        return
+    data.house_address = address.result
+    data.house_fias_id = address.house_fias_id
+    data.house_cadnum = address.house_cadnum
+    data.resolved_flat = address.flat
+    data.resolved_flat_cadnum = address.flat_cadnum
+    data.geo_lat = address.geo_lat
+    data.geo_lon = address.geo_lon
+    data.metro_stations = get_metro_stations(address)
+
+
+async def get_flat_cadastral_number(data: DataToGather) -> Optional[str]:
+    if data.resolved_flat_cadnum and data.resolved_flat == data.flat_number:
+        return data.resolved_flat_cadnum
+
+    if data.house_address:
+        query = f'{data.house_address}, кв {data.flat_number}'
+    else:
+        query = data.address + ' ' + data.flat_number
+
+    try:
+        address = await dadata_breaker.call(lambda: dadata.get_clean_data(query))
+    except (DadataException, CircuitBreakerError) as e:
+        logger.error(e)
+        return None
+    if data.geo_lat is None:
+        data.geo_lat = address.geo_lat
+        data.geo_lon = address.geo_lon
+    if data.house_fias_id is None:
+        data.house_fias_id = address.house_fias_id
+        data.metro_stations = get_metro_stations(address)
+    return address.flat_cadnum
+
+
 async def start_adding_room(update: Update, context: ContextTypes.DEFAULT_TYPE):
     message = await update.message.reply_text(
         'Введите ссылку на объявление',
@@ -107,9 +159,42 @@ async def add_room_url(update: Update, context: ContextTypes.DEFAULT_TYPE):
     if 'm.avito.ru' in url:
         url = url.replace('m.avito.ru', 'www.avito.ru')
 
+    item_id = extract_item_id(url)
+    if item_id is None:
+        message = await update.message.reply_text(
+            'Ссылка не подходит. Исправьте и отправьте еще раз.',
+        )
+        context.user_data['messages_to_delete'].extend([message, update.message])
+        return
+
+    try:
+        session = context.session
+    except AttributeError:
+        raise Exception('Session is not in context')
+
+    if await advertisement_service.advertisement_exists(session, item_id):
+        message = await update.message.reply_text(
+            'Это объявление уже добавлено. Отправьте другую ссылку.',
+        )
+        context.user_data['messages_to_delete'].extend([message, update.message])
+        return
+
+    await context.release_session()
     try:
-        result = await scrape_avito_room_ad(url)
-    except TooManyRequests:
+        result = await avito_breaker.call(lambda: scrape_avito_room_ad(url, retry=False))
+    except RateLimitExceeded:
+        message = await update.message.reply_text(
+            'Сейчас слишком много запросов к Авито, попробуйте через минуту',
+        )
+        context.user_data['messages_to_delete'].extend([message, update.message])
+        return
+    except DeadlineExceeded:
+        message = await update.message.reply_text(
+            'Авито слишком долго отвечает, попробуйте еще раз',
+        )
+        context.user_data['messages_to_delete'].extend([message, update.message])
+        return
+    except (TooManyRequests, CircuitBreakerError):
         message = await update.message.reply_text(
             'Авито блокирует подключения. Невозможно получить данные с сайте. Желаете добавить вручную?',
         )
@@ -123,6 +208,7 @@ async def add_room_url(update: Update, context: ContextTypes.DEFAULT_TYPE):
         return
 
     data = DataToGather(
+        item_id=item_id,
         url=url,
         price=result.price,
         description=result.description,
@@ -135,6 +221,7 @@ async def add_room_url(update: Update, context: ContextTypes.DEFAULT_TYPE):
     )
 
     context.user_data['data'] = data
+    context.application.create_task(prefetch_house_address(data), update=update)
 
     await update.message.delete()
     for message in context.user_data.get("messages_to_delete", []):
@@ -271,9 +358,9 @@ async def change_flat_number(update: Update, context: ContextTypes.DEFAULT_TYPE)
     data.flat_number = update.message.text
     context.user_data["data"] = data
 
-    address = dadata.get_clean_data(data.address + ' ' + data.flat_number)
+    cadastral_number = await get_flat_cadastral_number(data)
 
-    if not address.flat_cadnum:
+    if not cadastral_number:
         message = await update.effective_message.reply_text(
             text='Кадастровый номер (если нет данных -> /0)',
         )
@@ -282,7 +369,7 @@ async def change_flat_number(update: Update, context: ContextTypes.DEFAULT_TYPE)
         return AddRoomDialogStates.KADASTR_NUMBER
 
 
-    data.cadastral_number = address.flat_cadnum
+    data.cadastral_number = cadastral_number
     context.user_data["data"] = data
 
     message = await update.effective_message.reply_text(
@@ -579,13 +666,13 @@ async def send(update: Update, context: ContextTypes.DEFAULT_TYPE):
         view_type=data.view_type,
         toilet_type=data.toilet_type,
         under_room_is_living=data.room_under_is_living,
+        geo_lat=data.geo_lat,
+        geo_lon=data.geo_lon,
+        house_fias_id=data.house_fias_id,
     )
 
-    room = await room_service.create_room(session, room_create)
-
-    await room_info_service.create_rooms_info(session, data.rooms_info, room)
-
     advertisement_create = AdvertisementCreate(
+        item_id=data.item_id,
         url=data.url,
         price=data.price,
         contact_phone=data.contact_phone,
@@ -593,21 +680,30 @@ async def send(update: Update, context: ContextTypes.DEFAULT_TYPE):
         contact_name=data.contact_name,
         description=data.description,
 
-        room_id=room.id,
+        room_id=room_id,
 
         added_by_id=update.effective_user.id,
     )
 
-    advertisement = await advertisement_service.create_advertisement(session, advertisement_create)
+    advertisement_id = await submission_service.submit_advertisement(
+        session, room_create, data.rooms_info, advertisement_create, data.metro_stations,
+    )
+    if advertisement_id is None:
+        await context.release_session()
+        await update.effective_message.reply_text(
+            'Это объявление уже добавлено.',
+        )
+        return ConversationHandler.END
 
     admins = await user_service.get_admins(session)
+    await context.release_session()
     for admin in admins:
         if admin.id != update.effective_user.id:
             await context.bot.send_photo(
                 chat_id=admin.id,
                 photo=data.plan_telegram_file_id,
                 caption=fill_first_room_template(data),
-                reply_markup=get_review_keyboard(advertisement_id=advertisement.id),
+                reply_markup=get_review_keyboard(advertisement_id=advertisement_id),
                 parse_mode='HTML',
             )
 
@@ -648,14 +744,16 @@ async def cancel_info_adding(update: Update, context: ContextTypes.DEFAULT_TYPE)
     return ConversationHandler.END
 
 
-async def send_advertisement(session, bot: Bot, advertisement_id: int, user_id: int):
+async def get_advertisement_data(session, advertisement_id: int) -> DataToGather:
     advertisement = await advertisement_service.get_advertisement(session, advertisement_id)
-    await session.refresh(advertisement.room, attribute_names=["rooms_info"])
     advertisement = AdvertisementResponse.model_validate(advertisement)
-    data = DataToGather(
+    return DataToGather(
         **advertisement.model_dump(),
         **advertisement.room.model_dump(),
     )
+
+
+async def send_advertisement(bot: Bot, data: DataToGather, user_id: int):
     await bot.send_photo(
         chat_id=user_id,
         photo=data.plan_telegram_file_id,
@@ -689,12 +787,16 @@ async def view_advertisement(update: Update, context: ContextTypes.DEFAULT_TYPE)
         )
 
         if status == AdvertisementStatus.VIEWED:
+            dispatchers = await user_service.get_dispatchers(session)
+            data = await get_advertisement_data(session, advertisement_id)
+            await context.release_session()
+
             await update.effective_message.reply_text(
                 'Объявление помечено как хорошее',
             )
 
-            for user in await user_service.get_dispatchers(session):
-                await send_advertisement(session, context.bot, advertisement_id, user.id)
+            for user in dispatchers:
+                await send_advertisement(context.bot, data, user.id)
         elif status == AdvertisementStatus.CANCELED:
             await update.effective_message.reply_text(
                 'Объявление помечено как плохое'
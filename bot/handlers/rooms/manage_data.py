@@ -135,8 +135,13 @@ def fill_first_room_template(data: DataToGather) -> str:
         ]
     ) if data.rooms_info else ''
 
+    metro = '\nм. ' + ', '.join(
+        [f'{station.name} {station.distance}км' for station in data.metro_stations]
+    ) if data.metro_stations else ''
+
     return FIRST_ROOM_TEMPLATE.format(
         address=str(data.address),
+        metro=metro,
         flat_number=data.flat_number if data.flat_number else '',
         cadastral_number=data.cadastral_number if data.cadastral_number else '',
         price=str(price),
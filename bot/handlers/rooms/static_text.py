@@ -1,5 +1,5 @@
 FIRST_ROOM_TEMPLATE = """
-{address}, кв{flat_number} (КН{cadastral_number})
+{address}, кв{flat_number} (КН{cadastral_number}){metro}
 {price}тр({price_per_meter}тр/м2)
 эт-{flour}{room_under}/{flours_in_building}-{elevator} {entrance_type} {windows_type} {toilet_type}
 S-{flat_area}м2({living_area}={living_area_percent}%) h={flat_height}
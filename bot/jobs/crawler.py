@@ -0,0 +1,95 @@
+from telegram import Bot
+from telegram.error import RetryAfter, TelegramError
+from telegram.ext import ContextTypes
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from avito_parser import (iter_search_ads, iter_scrape_avito_room_ads, AvitoScrapingException, AvitoUnavailable,
+                          RateLimitExceeded, ResultCache)
+from database.types import DataToGather
+from bot.config import config
+from bot.service import user as user_service
+from bot.service import advertisement as advertisement_service
+from bot.handlers.rooms.manage_data import fill_parsed_room_template
+
+from logging import getLogger
+import asyncio
+
+from .static_text import NEW_ADVERTISEMENT_TEMPLATE
+
+
+logger = getLogger(__name__)
+
+
+async def notify(bot: Bot, chat_id: int, text: str):
+    try:
+        try:
+            await bot.send_message(chat_id=chat_id, text=text, parse_mode='HTML', disable_web_page_preview=True)
+        except RetryAfter as e:
+            await asyncio.sleep(e.retry_after)
+            await bot.send_message(chat_id=chat_id, text=text, parse_mode='HTML', disable_web_page_preview=True)
+    except TelegramError as e:
+        logger.error(f"Unable to send a new advertisement to {chat_id}: {e!r}")
+
+
+async def crawl_avito(context: ContextTypes.DEFAULT_TYPE):
+    session_maker: async_sessionmaker[AsyncSession] = context.job.data['session_maker']
+    cache: ResultCache = context.job.data['cache']
+    last_seen_id = context.bot_data.get('avito_last_seen_id')
+    # ads whose scrape failed for a reason that may go away, tried again on the next run
+    retry_urls: dict[int, str] = context.bot_data.get('avito_retry_urls', {})
+
+    found = []
+    try:
+        async for item_id, url in iter_search_ads(
+                config.avito_search_url,
+                last_seen_id=last_seen_id,
+                max_pages=config.avito_crawl_max_pages,
+        ):
+            found.append((item_id, url))
+    except AvitoScrapingException as e:
+        logger.error(f"Avito crawl stopped, will retry on the next run: {e}")
+        return
+
+    candidates = {**retry_urls, **dict(found)}
+    if not candidates:
+        logger.info("Avito crawl found no new ads")
+        return
+
+    async with session_maker() as session:
+        known_item_ids = await advertisement_service.get_known_item_ids(session, list(candidates))
+        admins = await user_service.get_admins(session)
+
+    new_ads = {url: item_id for item_id, url in candidates.items() if item_id not in known_item_ids}
+    logger.info(f"Avito crawl found {len(found)} ads, {len(new_ads)} of them are new "
+                f"({len(retry_urls)} retried from the last run)")
+
+    failed = {}
+    async for url, result in iter_scrape_avito_room_ads(
+            new_ads,
+            cache=cache,
+            max_concurrency=config.avito_background_concurrency,
+    ):
+        if isinstance(result, (AvitoUnavailable, RateLimitExceeded)):
+            logger.error(f"Unable to scrape {url}, will retry on the next run: {result}")
+            failed[new_ads[url]] = url
+            continue
+        if isinstance(result, AvitoScrapingException):
+            logger.error(f"Unable to scrape {url}, skipping it: {result}")
+            continue
+        data = DataToGather(
+            url=url,
+            price=result.price,
+            description=result.description,
+            room_area=result.room_area,
+            number_of_rooms_in_flat=result.number_of_rooms_in_flat,
+            flour=result.flour,
+            flours_in_building=result.flours_in_building,
+            address=result.address,
+        )
+        text = NEW_ADVERTISEMENT_TEMPLATE.format(room=fill_parsed_room_template(data))
+        for admin in admins:
+            await notify(context.bot, admin.id, text)
+
+    # saved only once the run went through, the highest id because promoted ads are not in id order
+    context.bot_data['avito_retry_urls'] = failed
+    if found:
+        context.bot_data['avito_last_seen_id'] = max([item_id for item_id, _ in found] + [last_seen_id or 0])
@@ -0,0 +1,14 @@
+from telegram.ext import ContextTypes
+from sqlalchemy.ext.asyncio import AsyncEngine
+from bot.utils.database import engine_metrics, pool_status
+
+from logging import getLogger
+
+
+logger = getLogger(__name__)
+
+
+async def log_db_metrics(context: ContextTypes.DEFAULT_TYPE):
+    engine: AsyncEngine = context.job.data['engine']
+    logger.info(f"Database metrics: {engine_metrics.stats | pool_status(engine)}")
+    engine_metrics.reset()
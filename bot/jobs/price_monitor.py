@@ -0,0 +1,73 @@
+from telegram.ext import ContextTypes
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from avito_parser import scrape_avito_room_ads, Result, ResultCache, RateLimitExceeded, TooManyRequests
+from database.types import AdvertisementPriceChange
+from bot.config import config
+from bot.service import advertisement as advertisement_service
+from bot.service import price_history as price_history_service
+
+from logging import getLogger
+
+
+logger = getLogger(__name__)
+
+
+async def monitor_prices(context: ContextTypes.DEFAULT_TYPE):
+    session_maker: async_sessionmaker[AsyncSession] = context.job.data['session_maker']
+    # own cache with no TTL: every ad is revalidated with its ETag and the interactive cache is left alone
+    cache: ResultCache = context.job.data['cache']
+
+    last_id = 0
+    checked = 0
+    changed = 0
+    failed = 0
+    while True:
+        async with session_maker() as session:
+            advertisements = await advertisement_service.get_active_advertisements(
+                session,
+                after_id=last_id,
+                limit=config.price_monitor_batch_size,
+            )
+        if not advertisements:
+            break
+        last_id = advertisements[-1].id
+
+        results = await scrape_avito_room_ads(
+            [advertisement.url for advertisement in advertisements],
+            cache=cache,
+            max_concurrency=config.avito_background_concurrency,
+        )
+
+        changes = []
+        for advertisement in advertisements:
+            result = results.get(advertisement.url)
+            if isinstance(result, Result) and result.price != advertisement.price:
+                changes.append(AdvertisementPriceChange(
+                    advertisement_id=advertisement.id,
+                    old_price=advertisement.price,
+                    new_price=result.price,
+                ))
+
+        if changes:
+            async with session_maker() as session:
+                await price_history_service.record_price_changes(session, changes)
+
+        errors = [result for result in results.values() if not isinstance(result, Result)]
+        checked += len(advertisements) - len(errors)
+        changed += len(changes)
+        failed += len(errors)
+        rate_limited = sum(isinstance(error, RateLimitExceeded) for error in errors)
+        if rate_limited:
+            logger.warning(f"Local rate limit left {rate_limited} advertisements unchecked, "
+                           f"the interactive scrapes are using the budget")
+
+        # only a real 429 from Avito stops the run, the local limiter merely ran out of budget
+        if any(isinstance(error, TooManyRequests) for error in errors):
+            async with session_maker() as session:
+                skipped = await advertisement_service.count_active_advertisements(session, after_id=last_id)
+            logger.warning(f"Avito is rate limiting, price monitor stopped after advertisement {last_id}, "
+                           f"{skipped} advertisements skipped until the next run")
+            break
+
+    logger.info(f"Price monitor checked {checked} advertisements, {changed} prices changed, "
+                f"{failed} could not be fetched")
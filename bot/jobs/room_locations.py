@@ -0,0 +1,62 @@
+from telegram.ext import ContextTypes
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from database.types import RoomLocation
+from bot.service import room as room_service
+from bot.service import metro as metro_service
+from bot.handlers.rooms.handlers import get_metro_stations
+from bot.utils.breakers import dadata_breaker
+from bot.utils.circuit_breaker import CircuitBreakerError, CircuitOpen
+from bot.utils.dadata_repository import dadata, DadataException
+
+from logging import getLogger
+
+
+logger = getLogger(__name__)
+
+
+async def backfill_room_locations(context: ContextTypes.DEFAULT_TYPE):
+    """Geocode rooms added before coordinates were stored, so /nearby and /metro can find them."""
+    session_maker: async_sessionmaker[AsyncSession] = context.job.data['session_maker']
+
+    last_id = 0
+    located = 0
+    failed = 0
+    while True:
+        async with session_maker() as session:
+            rooms = await room_service.get_rooms_without_location(session, after_id=last_id)
+        if not rooms:
+            break
+        last_id = rooms[-1].id
+
+        locations = []
+        stations = {}
+        for room in rooms:
+            try:
+                # goes through the Dadata cache, rooms of one house cost a single request
+                address = await dadata_breaker.call(lambda: dadata.get_clean_data(room.address))
+            except CircuitOpen:
+                logger.warning(f"Dadata is unavailable, room location backfill stopped before room {room.id}")
+                return
+            except (DadataException, CircuitBreakerError) as e:
+                logger.error(f"Unable to geocode room {room.id}: {e!r}")
+                failed += 1
+                continue
+            if address.geo_lat is None or address.geo_lon is None:
+                failed += 1
+                continue
+            locations.append(RoomLocation(
+                room_id=room.id,
+                geo_lat=address.geo_lat,
+                geo_lon=address.geo_lon,
+                house_fias_id=address.house_fias_id,
+            ))
+            if address.house_fias_id:
+                stations[address.house_fias_id] = get_metro_stations(address)
+
+        async with session_maker() as session:
+            for house_fias_id, house_stations in stations.items():
+                await metro_service.add_house_metro_stations(session, house_fias_id, house_stations)
+            await room_service.set_room_locations(session, locations)
+        located += len(locations)
+
+    logger.info(f"Room location backfill located {located} rooms, {failed} could not be geocoded")
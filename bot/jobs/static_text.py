@@ -0,0 +1,3 @@
+NEW_ADVERTISEMENT_TEMPLATE = """
+<b>Новое объявление на Авито</b>
+{room}"""
@@ -1,9 +1,10 @@
 from .user_middleware import UserMiddleware
-from .session_middleware import SessionMiddleware
+from .session_middleware import SessionMiddleware, SessionProvider
 from .middleware import Middleware
 
 __all__ = [
     'UserMiddleware',
     'SessionMiddleware',
+    'SessionProvider',
     'Middleware',
 ]
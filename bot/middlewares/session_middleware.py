@@ -2,7 +2,45 @@ import logging
 from telegram import Update
 from telegram.ext import ContextTypes
 from .abstract_middleware import AbstractMiddleware
-from sqlalchemy.ext.asyncio import AsyncSession, AsyncEngine, async_sessionmaker
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+
+class SessionProvider:
+    """The database session of one update, created on first use.
+
+    A session checks out a pool connection on its first query and keeps it until the
+    transaction ends. Handlers call ``release`` before slow external I/O (Avito, Dadata,
+    Telegram sends) so the connection goes back to the pool instead of idling in a
+    transaction. The next query checks out a connection again.
+    """
+
+    def __init__(self, session_maker: async_sessionmaker[AsyncSession]):
+        self.session_maker = session_maker
+        self._session: AsyncSession | None = None
+
+    @property
+    def session(self) -> AsyncSession:
+        if self._session is None:
+            self._session = self.session_maker()
+        return self._session
+
+    @property
+    def holds_connection(self) -> bool:
+        return self._session is not None and self._session.in_transaction()
+
+    async def release(self):
+        """Commit the work done so far and return the connection to the pool."""
+        if self.holds_connection:
+            await self._session.commit()
+
+    async def close(self):
+        if self._session is None:
+            return
+        try:
+            await self._session.commit()
+        finally:
+            await self._session.close()
+            self._session = None
 
 
 class SessionMiddleware(AbstractMiddleware):
@@ -11,17 +49,14 @@ class SessionMiddleware(AbstractMiddleware):
         self.logger = logging.getLogger(__name__)
 
     async def on_update(self, update: Update, context: ContextTypes):
-        session = self.session_maker()
-        context.__setattr__('session', session)
+        context.__setattr__('session_provider', SessionProvider(self.session_maker))
 
     async def after_update(self, update: Update, context: ContextTypes):
         try:
-            session: AsyncSession = context.__getattribute__('session')
+            provider: SessionProvider = context.__getattribute__('session_provider')
         except AttributeError:
-            self.logger.warning('SessionMiddleware: session is not found in context')
+            self.logger.warning('SessionMiddleware: session provider is not found in context')
         else:
-            if session:
-                await session.commit()
-                await session.close()
-                context.__delattr__('session')
-                self.logger.debug('SessionMiddleware: session is closed')
+            await provider.close()
+            context.__delattr__('session_provider')
+            self.logger.debug('SessionMiddleware: session is closed')
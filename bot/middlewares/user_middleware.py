@@ -4,7 +4,8 @@ from telegram.ext import ContextTypes
 from .abstract_middleware import AbstractMiddleware
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from bot.service.user import get_user, create_user
+from bot.service.user import get_or_create_user_identity
+from bot.utils.user_cache import user_cache, UserIdentity
 from database.types import UserCreate
 
 
@@ -13,21 +14,23 @@ class UserMiddleware(AbstractMiddleware):
         self.logger = logging.getLogger(__name__)
 
     async def on_update(self, update: Update, context: ContextTypes):
-        try:
-            session: AsyncSession = context.__getattribute__('session')
-        except AttributeError:
-            raise Exception('SessionMiddleware: session is not found in context')
-        else:
-            user = await get_user(session, update.effective_user.id)
-            if not user:
-                user_create = UserCreate(
-                    id=update.effective_user.id,
-                    username=update.effective_user.username,
-                    first_name=update.effective_user.first_name,
-                    last_name=update.effective_user.last_name,
-                )
-                user = await create_user(session, user_create)
-            context.__setattr__('database_user', user)
+        user = user_cache.get(update.effective_user.id)
+        if user is None:
+            try:
+                session: AsyncSession = context.session
+            except AttributeError:
+                raise Exception('SessionMiddleware: session is not found in context')
+            user_create = UserCreate(
+                id=update.effective_user.id,
+                username=update.effective_user.username,
+                first_name=update.effective_user.first_name,
+                last_name=update.effective_user.last_name,
+            )
+            row = await get_or_create_user_identity(session, user_create)
+            await context.release_session()
+            user = UserIdentity(id=row.id, username=row.username, role=row.role)
+            user_cache.set(user)
+        context.__setattr__('database_user', user)
 
     async def after_update(self, update: Update, context: ContextTypes):
         try:
@@ -1,36 +1,148 @@
-from sqlalchemy import select, func
+from sqlalchemy import Select, select, update, func, or_, bindparam
+from sqlalchemy.orm import contains_eager, joinedload
 from sqlalchemy.ext.asyncio import AsyncSession
-from database.models import Advertisement
-from database.types import AdvertisementCreate
+from database.models import Advertisement, Room, HouseMetroStation
+from bot.service.metro import station_name_matches
+from bot.utils.geo import geohash_cells_around, covered_radius_km, distance_km
 from database.types import AdvertisementStatus
+from database.enums import ACTIVE_ADVERTISEMENT_STATUSES
+from sqlalchemy.engine import Row
 from typing import Optional
 
 
-async def create_advertisement(session: AsyncSession, advertisement: AdvertisementCreate) -> Advertisement:
-    advertisement = Advertisement(**advertisement.model_dump())
-    session.add(advertisement)
-    await session.commit()
-    await session.refresh(advertisement)
-    await session.refresh(advertisement, attribute_names=["added_by", "viewed_by", "assigned_to", "room"])
-    return advertisement
+NEARBY_PRECISIONS = (6, 5, 4)
+
+
+def is_active():
+    # statuses are rendered as literals, with bound parameters the planner
+    # could not match the ix_advertisement_active_id partial index
+    return Advertisement.status.in_(
+        bindparam(
+            'active_statuses',
+            list(ACTIVE_ADVERTISEMENT_STATUSES),
+            type_=Advertisement.status.type,
+            expanding=True,
+            literal_execute=True,
+        )
+    )
+
+
+def with_details(statement: Select) -> Select:
+    """Load an advertisement with its users, room and room details in two queries.
+
+    Many-to-one relationships and the room infos come in one joined select, the metro
+    stations (matched on house_fias_id, not a foreign key) in a second selectin query.
+    """
+    room = joinedload(Advertisement.room)
+    return statement.options(
+        joinedload(Advertisement.added_by),
+        joinedload(Advertisement.viewed_by),
+        joinedload(Advertisement.assigned_to),
+        room.joinedload(Room.rooms_info),
+        room.selectinload(Room.metro_stations),
+    ).execution_options(populate_existing=True)
 
 
 async def get_advertisement(session: AsyncSession, advertisement_id: int) -> Optional[Advertisement]:
-    result = await session.execute(select(Advertisement).filter(Advertisement.id == advertisement_id))
-    advertisement = result.scalars().first()
-    if not advertisement:
-        return None
-    await session.refresh(advertisement, attribute_names=["added_by", "viewed_by", "assigned_to", "room"])
-    return advertisement
+    result = await session.execute(with_details(select(Advertisement).filter(Advertisement.id == advertisement_id)))
+    return result.unique().scalars().first()
+
+
+async def get_advertisement_by_item_id(session: AsyncSession, item_id: int) -> Optional[Advertisement]:
+    result = await session.execute(with_details(select(Advertisement).filter(Advertisement.item_id == item_id)))
+    return result.unique().scalars().first()
+
+
+async def advertisement_exists(session: AsyncSession, item_id: int) -> bool:
+    result = await session.execute(select(Advertisement.id).filter(Advertisement.item_id == item_id).limit(1))
+    return result.scalar() is not None
+
+
+async def get_known_item_ids(session: AsyncSession, item_ids: list[int]) -> set[int]:
+    if not item_ids:
+        return set()
+    result = await session.execute(select(Advertisement.item_id).filter(Advertisement.item_id.in_(item_ids)))
+    return set(result.scalars().all())
 
 
-async def get_advertisement_by_url(session: AsyncSession, url: str) -> Optional[Advertisement]:
-    result = await session.execute(select(Advertisement).filter(Advertisement.url == url))
-    advertisement = result.scalars().first()
-    if not advertisement:
-        return None
-    await session.refresh(advertisement, attribute_names=["added_by", "viewed_by", "assigned_to", "room"])
-    return advertisement
+async def get_active_advertisements(
+        session: AsyncSession,
+        after_id: int = 0,
+        limit: int = 200,
+) -> list[Row]:
+    result = await session.execute(
+        select(Advertisement.id, Advertisement.url, Advertisement.price)
+        .filter(is_active(), Advertisement.id > after_id)
+        .order_by(Advertisement.id)
+        .limit(limit)
+    )
+    return list(result.all())
+
+
+async def count_active_advertisements(session: AsyncSession, after_id: int = 0) -> int:
+    return await session.scalar(
+        select(func.count()).select_from(Advertisement).filter(is_active(), Advertisement.id > after_id)
+    )
+
+
+async def get_nearby_advertisements(
+        session: AsyncSession,
+        lat: float,
+        lon: float,
+        limit: int = 5,
+        exclude_id: Optional[int] = None,
+) -> list[tuple[Advertisement, float]]:
+    """Closest active advertisements to the point, with distances in km.
+
+    Candidates are fetched by geohash prefix from the 3x3 block of cells around the point,
+    widening the cells until the block is known to contain the ``limit`` nearest rooms.
+    """
+    nearest = []
+    for precision in NEARBY_PRECISIONS:
+        statement = (
+            select(Advertisement)
+            .join(Advertisement.room)
+            .options(contains_eager(Advertisement.room))
+            .filter(
+                is_active(),
+                or_(*[Room.geohash.like(f'{cell}%') for cell in geohash_cells_around(lat, lon, precision)]),
+            )
+        )
+        if exclude_id is not None:
+            statement = statement.filter(Advertisement.id != exclude_id)
+        result = await session.execute(statement)
+
+        nearest = sorted(
+            ((advertisement, distance_km(lat, lon, advertisement.room.geo_lat, advertisement.room.geo_lon))
+             for advertisement in result.scalars().unique()),
+            key=lambda pair: pair[1],
+        )[:limit]
+        if len(nearest) == limit and nearest[-1][1] <= covered_radius_km(lat, precision):
+            break
+    return nearest
+
+
+async def get_advertisements_near_station(
+        session: AsyncSession,
+        station: str,
+        max_distance: float,
+        limit: int = 20,
+) -> list[tuple[Advertisement, float]]:
+    """Active advertisements in buildings within ``max_distance`` km of the metro station."""
+    result = await session.execute(
+        select(Advertisement, HouseMetroStation.distance)
+        .join(Advertisement.room)
+        .join(HouseMetroStation, HouseMetroStation.house_fias_id == Room.house_fias_id)
+        .options(contains_eager(Advertisement.room))
+        .filter(
+            is_active(),
+            station_name_matches(station),
+            HouseMetroStation.distance <= max_distance,
+        )
+        .order_by(HouseMetroStation.distance)
+        .limit(limit)
+    )
+    return [(advertisement, distance) for advertisement, distance in result.all()]
 
 
 async def update_advertisement_status(
@@ -39,13 +151,12 @@ async def update_advertisement_status(
         new_status: AdvertisementStatus,
         changed_by_user_id: int
 ) -> Advertisement:
-    advertisement = await get_advertisement(session, advertisement_id)
-    if not advertisement:
+    result = await session.execute(
+        update(Advertisement)
+        .where(Advertisement.id == advertisement_id)
+        .values(status=new_status, viewed_by_id=changed_by_user_id, viewed_at=func.now())
+    )
+    if not result.rowcount:
         raise ValueError('Advertisement not found')
-    advertisement.status = new_status
-    advertisement.viewed_by_id = changed_by_user_id
-    advertisement.viewed_at = func.now()
     await session.commit()
-    await session.refresh(advertisement)
-    await session.refresh(advertisement, attribute_names=["added_by", "viewed_by", "assigned_to", "room"])
-    return advertisement
+    return await get_advertisement(session, advertisement_id)
@@ -0,0 +1,28 @@
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from database.models import DadataAddressCache
+from datetime import datetime
+from typing import Any, Optional
+
+
+async def get_cached_address(session: AsyncSession, address_key: str, newer_than: datetime) -> Optional[dict[str, Any]]:
+    result = await session.execute(
+        select(DadataAddressCache.payload)
+        .filter(DadataAddressCache.address_key == address_key, DadataAddressCache.created_at > newer_than)
+    )
+    return result.scalar()
+
+
+async def save_cached_address(session: AsyncSession, address_key: str, payload: dict[str, Any]):
+    statement = insert(DadataAddressCache).values(
+        address_key=address_key,
+        payload=payload,
+        created_at=datetime.utcnow(),
+    )
+    statement = statement.on_conflict_do_update(
+        index_elements=[DadataAddressCache.address_key],
+        set_={'payload': statement.excluded.payload, 'created_at': statement.excluded.created_at},
+    )
+    await session.execute(statement)
+    await session.commit()
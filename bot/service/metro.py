@@ -0,0 +1,23 @@
+from sqlalchemy import func
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from database.models import HouseMetroStation
+from database.types import MetroStation
+
+
+async def add_house_metro_stations(session: AsyncSession, house_fias_id: str, stations: list[MetroStation]):
+    """Insert the stations of a building unless they are known already, the caller commits."""
+    if not house_fias_id or not stations:
+        return
+    statement = insert(HouseMetroStation).values(
+        [{'house_fias_id': house_fias_id, **station.model_dump()} for station in stations]
+    )
+    statement = statement.on_conflict_do_nothing(
+        index_elements=[HouseMetroStation.house_fias_id, HouseMetroStation.name],
+    )
+    await session.execute(statement)
+
+
+def station_name_matches(name: str):
+    # matches the ix_house_metro_station_name_distance expression index
+    return func.lower(HouseMetroStation.name) == name.strip().lower()
@@ -0,0 +1,18 @@
+from sqlalchemy import insert, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from database.models import Advertisement, AdvertisementPriceHistory
+from database.types import AdvertisementPriceChange
+
+
+async def record_price_changes(session: AsyncSession, changes: list[AdvertisementPriceChange]):
+    if not changes:
+        return
+    await session.execute(
+        update(Advertisement),
+        [{'id': change.advertisement_id, 'price': change.new_price} for change in changes],
+    )
+    await session.execute(
+        insert(AdvertisementPriceHistory),
+        [change.model_dump() for change in changes],
+    )
+    await session.commit()
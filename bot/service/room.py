@@ -1,7 +1,9 @@
-from sqlalchemy import select
+from sqlalchemy import select, update
+from sqlalchemy.engine import Row
 from sqlalchemy.ext.asyncio import AsyncSession
 from database.models import Room
-from database.types import RoomCreate
+from database.types import RoomCreate, RoomLocation
+from bot.utils.geo import encode_geohash
 from typing import Optional
 
 
@@ -11,12 +13,37 @@ async def get_room(session: AsyncSession, room_id: int) -> Optional[Room]:
     return room
 
 
-async def create_room(session: AsyncSession, room: RoomCreate) -> Room:
-    if await get_room(session, room.id):
-        raise ValueError('This room already exists')
+def room_values(room: RoomCreate) -> dict:
+    values = room.model_dump()
+    if room.geo_lat is not None and room.geo_lon is not None:
+        values['geohash'] = encode_geohash(room.geo_lat, room.geo_lon)
+    return values
 
-    room = Room(**room.model_dump())
-    session.add(room)
+
+async def get_rooms_without_location(session: AsyncSession, after_id: int = 0, limit: int = 100) -> list[Row]:
+    result = await session.execute(
+        select(Room.id, Room.address)
+        .filter(Room.geo_lat.is_(None), Room.address != '', Room.id > after_id)
+        .order_by(Room.id)
+        .limit(limit)
+    )
+    return list(result.all())
+
+
+async def set_room_locations(session: AsyncSession, locations: list[RoomLocation]):
+    if not locations:
+        return
+    await session.execute(
+        update(Room),
+        [
+            {
+                'id': location.room_id,
+                'geo_lat': location.geo_lat,
+                'geo_lon': location.geo_lon,
+                'geohash': encode_geohash(location.geo_lat, location.geo_lon),
+                'house_fias_id': location.house_fias_id,
+            }
+            for location in locations
+        ],
+    )
     await session.commit()
-    await session.refresh(room)
-    return room
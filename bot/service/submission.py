@@ -0,0 +1,55 @@
+from sqlalchemy import insert
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from database.models import Room, RoomInfo, Advertisement
+from database.types import RoomCreate, RoomInfoCreate, AdvertisementCreate, MetroStation
+from bot.service.room import room_values
+from bot.service.metro import add_house_metro_stations
+from bot.service.advertisement import advertisement_exists
+
+
+async def submit_advertisement(
+        session: AsyncSession,
+        room: RoomCreate,
+        rooms_info: list[RoomInfoCreate],
+        advertisement: AdvertisementCreate,
+        metro_stations: list[MetroStation] | None = None,
+) -> int | None:
+    """Write the room, its room infos, metro stations and the advertisement in one transaction.
+
+    Returns the id of the new advertisement, or None if an advertisement with the same item id
+    has already been added (e.g. by a concurrent submission). Nothing is written in that case
+    or if any of the inserts fails.
+    """
+    try:
+        result = await session.execute(
+            pg_insert(Room).values(**room_values(room)).on_conflict_do_nothing().returning(Room.id)
+        )
+        if result.scalar() is None:
+            if advertisement.item_id is not None and await advertisement_exists(session, advertisement.item_id):
+                await session.rollback()
+                return None
+            raise ValueError('This room already exists')
+
+        if rooms_info:
+            await session.execute(
+                insert(RoomInfo),
+                [{**room_info.model_dump(), 'main_room_id': room.id} for room_info in rooms_info],
+            )
+        await add_house_metro_stations(session, room.house_fias_id, metro_stations or [])
+
+        result = await session.execute(
+            pg_insert(Advertisement)
+            .values(**advertisement.model_dump())
+            .on_conflict_do_nothing(index_elements=[Advertisement.item_id])
+            .returning(Advertisement.id)
+        )
+        advertisement_id = result.scalar()
+        if advertisement_id is None:
+            await session.rollback()
+            return None
+    except Exception:
+        await session.rollback()
+        raise
+    await session.commit()
+    return advertisement_id
@@ -1,8 +1,11 @@
 from sqlalchemy import select, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.engine import Row
 from sqlalchemy.ext.asyncio import AsyncSession
 from database.models import User
 from database.types import UserCreate
 from database.enums import UserRole
+from bot.utils.user_cache import user_cache
 from typing import Optional
 
 
@@ -18,20 +21,26 @@ async def get_user_by_username(session: AsyncSession, username: str) -> Optional
     return user
 
 
-async def create_user(session: AsyncSession, user: UserCreate) -> User:
-    if await get_user(session, user.id):
-        raise ValueError('This user already exists')
+async def get_or_create_user_identity(session: AsyncSession, user: UserCreate) -> Row:
+    """Insert the user unless it exists and return its (id, username, role).
 
-    user = User(**user.model_dump())
-    session.add(user)
+    Always a single INSERT ... ON CONFLICT DO UPDATE RETURNING, which also keeps the username current.
+    """
+    statement = insert(User).values(**user.model_dump())
+    result = await session.execute(
+        statement
+        .on_conflict_do_update(index_elements=[User.id], set_={'username': statement.excluded.username})
+        .returning(User.id, User.username, User.role)
+    )
+    row = result.one()
     await session.commit()
-    await session.refresh(user)
-    return user
+    return row
 
 
 async def update_user_role(session: AsyncSession, username: str, role: UserRole) -> User:
     await session.execute(update(User).where(User.username == username).values(role=role))
     await session.commit()
+    user_cache.invalidate_username(username)
     return await get_user_by_username(session, username)
 
 
@@ -0,0 +1,23 @@
+from avito_parser import AvitoUnavailable
+from bot.config import config
+from .circuit_breaker import CircuitBreaker
+from .dadata_repository import DadataException
+
+
+avito_breaker = CircuitBreaker(
+    'avito',
+    timeout=config.avito_deadline,
+    # only errors that came from Avito: a broken or removed ad says nothing about its health
+    # and RateLimitExceeded, raised by our own limiter, is not an AvitoUnavailable
+    failure_exceptions=(AvitoUnavailable,),
+    failure_threshold=config.breaker_failure_threshold,
+    recovery_timeout=config.breaker_recovery_timeout,
+)
+
+dadata_breaker = CircuitBreaker(
+    'dadata',
+    timeout=config.dadata_deadline,
+    failure_exceptions=(DadataException,),
+    failure_threshold=config.breaker_failure_threshold,
+    recovery_timeout=config.breaker_recovery_timeout,
+)
@@ -0,0 +1,94 @@
+from typing import Awaitable, Callable, TypeVar
+import asyncio
+import logging
+import time
+
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar('T')
+
+
+class CircuitBreakerError(Exception):
+    pass
+
+
+class CircuitOpen(CircuitBreakerError):
+    pass
+
+
+class DeadlineExceeded(CircuitBreakerError):
+    pass
+
+
+class CircuitBreaker:
+    """Fails fast while an external dependency is down and bounds every call by a deadline.
+
+    After ``failure_threshold`` consecutive failures (timeouts or ``failure_exceptions``) the
+    circuit opens and calls raise CircuitOpen at once. After ``recovery_timeout`` a single probe
+    call is let through (half-open): success closes the circuit, failure opens it again.
+    """
+
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+
+    def __init__(
+            self,
+            name: str,
+            timeout: float,
+            failure_exceptions: tuple[type[Exception], ...] = (),
+            failure_threshold: int = 5,
+            recovery_timeout: float = 30.0,
+    ):
+        self.name = name
+        self.timeout = timeout
+        self.failure_exceptions = failure_exceptions
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+
+    def _before_call(self) -> bool:
+        """Return True if this call is the half-open probe."""
+        if self.state == self.CLOSED:
+            return False
+        if self.state == self.OPEN and time.monotonic() - self._opened_at >= self.recovery_timeout:
+            self.state = self.HALF_OPEN
+        if self.state == self.HALF_OPEN and not self._probe_in_flight:
+            self._probe_in_flight = True
+            return True
+        raise CircuitOpen(f"{self.name} is unavailable, circuit is {self.state}")
+
+    def _on_success(self):
+        if self.state != self.CLOSED:
+            logger.info(f"{self.name} circuit closed")
+        self.state = self.CLOSED
+        self._failures = 0
+
+    def _on_failure(self):
+        self._failures += 1
+        if self.state == self.HALF_OPEN or self._failures >= self.failure_threshold:
+            if self.state != self.OPEN:
+                logger.warning(f"{self.name} circuit opened after {self._failures} failures")
+            self.state = self.OPEN
+            self._opened_at = time.monotonic()
+
+    async def call(self, func: Callable[[], Awaitable[T]], timeout: float | None = None) -> T:
+        is_probe = self._before_call()
+        try:
+            result = await asyncio.wait_for(func(), self.timeout if timeout is None else timeout)
+        except asyncio.TimeoutError:
+            self._on_failure()
+            raise DeadlineExceeded(f"{self.name} did not answer in {self.timeout if timeout is None else timeout}s")
+        except self.failure_exceptions:
+            self._on_failure()
+            raise
+        else:
+            self._on_success()
+            return result
+        finally:
+            if is_probe:
+                self._probe_in_flight = False
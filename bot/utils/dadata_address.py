@@ -0,0 +1,53 @@
+from dataclasses import dataclass, field
+from typing import Any
+import json
+
+
+def _to_float(value: Any) -> float | None:
+    if value in (None, ''):
+        return None
+    return float(value)
+
+
+@dataclass(slots=True)
+class DadataAddress:
+    """The part of a Dadata clean/address response the bot uses.
+
+    The full response is kept as encoded JSON in ``raw`` and decoded only on demand.
+    """
+
+    result: str | None
+    flat: str | None
+    flat_area: float | None
+    flat_cadnum: str | None
+    flat_fias_id: str | None
+    house_cadnum: str | None
+    house_fias_id: str | None
+    fias_id: str | None
+    geo_lat: float | None
+    geo_lon: float | None
+    raw: bytes = field(default=b'{}', repr=False)
+
+    @classmethod
+    def from_payload(cls, payload: dict[str, Any], raw: bytes | None = None) -> 'DadataAddress':
+        return cls(
+            result=payload.get('result'),
+            flat=payload.get('flat'),
+            flat_area=_to_float(payload.get('flat_area')),
+            flat_cadnum=payload.get('flat_cadnum'),
+            flat_fias_id=payload.get('flat_fias_id'),
+            house_cadnum=payload.get('house_cadnum'),
+            house_fias_id=payload.get('house_fias_id'),
+            fias_id=payload.get('fias_id'),
+            geo_lat=_to_float(payload.get('geo_lat')),
+            geo_lon=_to_float(payload.get('geo_lon')),
+            raw=raw if raw is not None else json.dumps(payload, ensure_ascii=False).encode(),
+        )
+
+    @property
+    def payload(self) -> dict[str, Any]:
+        return json.loads(self.raw)
+
+    @property
+    def metro(self) -> list[dict[str, Any]] | None:
+        return self.payload.get('metro')
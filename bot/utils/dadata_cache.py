@@ -0,0 +1,93 @@
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from bot.service import dadata_cache as dadata_cache_service
+from .dadata_address import DadataAddress
+import logging
+import re
+import time
+
+
+logger = logging.getLogger(__name__)
+
+_SEPARATORS_PATTERN = re.compile(r'[\s,.]+')
+
+
+def normalize_address(address: str) -> str:
+    return _SEPARATORS_PATTERN.sub(' ', address.lower().replace('ё', 'е')).strip()
+
+
+class DadataCache:
+    """Two-tier cache of Dadata clean results: an in-memory LRU in front of a Postgres table."""
+
+    def __init__(
+            self,
+            session_maker: async_sessionmaker[AsyncSession],
+            max_size: int = 1024,
+            ttl: float = 30 * 24 * 3600,
+            request_cost: float = 0.0,
+    ):
+        self.session_maker = session_maker
+        self.max_size = max_size
+        self.ttl = ttl
+        self.request_cost = request_cost
+        self._entries: OrderedDict[str, tuple[DadataAddress, float]] = OrderedDict()
+        self.memory_hits = 0
+        self.db_hits = 0
+        self.misses = 0
+
+    @property
+    def stats(self) -> dict[str, float]:
+        return {
+            'memory_hits': self.memory_hits,
+            'db_hits': self.db_hits,
+            'misses': self.misses,
+            'cost_saved': (self.memory_hits + self.db_hits) * self.request_cost,
+        }
+
+    def _remember(self, key: str, address: DadataAddress, expires_at: float):
+        self._entries[key] = (address, expires_at)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    async def get(self, address: str) -> DadataAddress | None:
+        key = normalize_address(address)
+
+        entry = self._entries.get(key)
+        if entry is not None:
+            cached, expires_at = entry
+            if time.monotonic() < expires_at:
+                self._entries.move_to_end(key)
+                self.memory_hits += 1
+                return cached
+            del self._entries[key]
+
+        try:
+            async with self.session_maker() as session:
+                payload = await dadata_cache_service.get_cached_address(
+                    session,
+                    key,
+                    newer_than=datetime.utcnow() - timedelta(seconds=self.ttl),
+                )
+        except SQLAlchemyError as e:
+            logger.error(f"Dadata cache lookup failed: {e!r}")
+            payload = None
+
+        if payload is None:
+            self.misses += 1
+            return None
+        cached = DadataAddress.from_payload(payload)
+        self._remember(key, cached, time.monotonic() + self.ttl)
+        self.db_hits += 1
+        return cached
+
+    async def set(self, address: str, result: DadataAddress):
+        key = normalize_address(address)
+        self._remember(key, result, time.monotonic() + self.ttl)
+        try:
+            async with self.session_maker() as session:
+                await dadata_cache_service.save_cached_address(session, key, result.payload)
+        except SQLAlchemyError as e:
+            logger.error(f"Dadata cache save failed: {e!r}")
@@ -0,0 +1,127 @@
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+from sqlalchemy.util.queue import AsyncAdaptedQueue
+from uuid import uuid4
+import logging
+import time
+
+
+logger = logging.getLogger(__name__)
+
+
+class EngineMetrics:
+    """Pool checkout waits and asyncpg prepared statement cache hits since the last reset."""
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.checkouts = 0
+        self.checkout_wait_total = 0.0
+        self.checkout_wait_max = 0.0
+        self.statements = 0
+        self.prepares = 0
+
+    def record_checkout(self, wait: float):
+        self.checkouts += 1
+        self.checkout_wait_total += wait
+        self.checkout_wait_max = max(self.checkout_wait_max, wait)
+
+    @property
+    def stats(self) -> dict[str, float]:
+        average_wait = self.checkout_wait_total / self.checkouts if self.checkouts else 0.0
+        return {
+            'checkouts': self.checkouts,
+            'checkout_wait_avg_ms': round(average_wait * 1000, 2),
+            'checkout_wait_max_ms': round(self.checkout_wait_max * 1000, 2),
+            'statements': self.statements,
+            'statement_cache_hit_rate': round(1 - self.prepares / self.statements, 3) if self.statements else 0.0,
+        }
+
+
+engine_metrics = EngineMetrics()
+
+
+class TimedAsyncAdaptedQueue(AsyncAdaptedQueue):
+    """Pool queue that reports how long every get waited for a free connection.
+
+    Timing the queue rather than the pool checkout leaves out the time spent opening
+    a new overflow connection when the queue is empty.
+    """
+
+    metrics: EngineMetrics = engine_metrics
+
+    def get(self, block: bool = True, timeout: float | None = None):
+        started = time.perf_counter()
+        try:
+            return super().get(block, timeout)
+        finally:
+            self.metrics.record_checkout(time.perf_counter() - started)
+
+
+class TimedAsyncQueuePool(AsyncAdaptedQueuePool):
+    """Queue pool that reports how long every checkout waited for a free connection."""
+
+    _queue_class = TimedAsyncAdaptedQueue
+
+
+def _statement_name_func(unique: bool):
+    # called by the asyncpg dialect once per statement it has to prepare, i.e. per cache miss
+    def name() -> str | None:
+        engine_metrics.prepares += 1
+        # pgbouncer in transaction mode may hand the next statement to another server
+        # connection, so statement names must not repeat between client connections
+        return f'__asyncpg_{uuid4()}__' if unique else None
+    return name
+
+
+def create_engine(
+        url: str,
+        echo: bool = False,
+        pool_size: int = 5,
+        max_overflow: int = 10,
+        pool_timeout: float = 30.0,
+        pool_recycle: int = 1800,
+        pool_pre_ping: bool = True,
+        statement_cache_size: int = 100,
+        pgbouncer: bool = False,
+) -> AsyncEngine:
+    connect_args = {
+        'prepared_statement_cache_size': 0 if pgbouncer else statement_cache_size,
+        'prepared_statement_name_func': _statement_name_func(unique=pgbouncer),
+    }
+    if pgbouncer:
+        connect_args['statement_cache_size'] = 0
+
+    engine = create_async_engine(
+        url,
+        echo=echo,
+        poolclass=TimedAsyncQueuePool,
+        pool_size=pool_size,
+        max_overflow=max_overflow,
+        pool_timeout=pool_timeout,
+        pool_recycle=pool_recycle,
+        pool_pre_ping=pool_pre_ping,
+        connect_args=connect_args,
+    )
+
+    @event.listens_for(engine.sync_engine, 'before_cursor_execute')
+    def count_statement(conn, cursor, statement, parameters, context, executemany):
+        # asyncpg runs executemany through its own statement cache, which never calls the
+        # name func, so counting it would make every bulk write look like a cache hit
+        if not executemany:
+            engine_metrics.statements += 1
+
+    logger.info(f"Database engine created (pool {pool_size}+{max_overflow}, "
+                f"statement cache {connect_args['prepared_statement_cache_size']}, pgbouncer={pgbouncer})")
+    return engine
+
+
+def pool_status(engine: AsyncEngine) -> dict[str, int]:
+    pool = engine.pool
+    return {
+        'pool_size': pool.size(),
+        'checked_out': pool.checkedout(),
+        'overflow': pool.overflow(),
+    }
@@ -0,0 +1,63 @@
+from math import asin, cos, radians, sin, sqrt
+
+
+_BASE32 = '0123456789bcdefghjkmnpqrstuvwxyz'
+EARTH_RADIUS_KM = 6371.0
+
+
+def encode_geohash(lat: float, lon: float, precision: int = 9) -> str:
+    lat_range = [-90.0, 90.0]
+    lon_range = [-180.0, 180.0]
+    geohash = []
+    bits = 0
+    bit_count = 0
+    even = True
+    while len(geohash) < precision:
+        value_range, value = (lon_range, lon) if even else (lat_range, lat)
+        middle = (value_range[0] + value_range[1]) / 2
+        bits <<= 1
+        if value >= middle:
+            bits |= 1
+            value_range[0] = middle
+        else:
+            value_range[1] = middle
+        even = not even
+        bit_count += 1
+        if bit_count == 5:
+            geohash.append(_BASE32[bits])
+            bits = 0
+            bit_count = 0
+    return ''.join(geohash)
+
+
+def _cell_size(precision: int) -> tuple[float, float]:
+    lon_bits = (precision * 5 + 1) // 2
+    lat_bits = precision * 5 // 2
+    return 180.0 / 2 ** lat_bits, 360.0 / 2 ** lon_bits
+
+
+def geohash_cells_around(lat: float, lon: float, precision: int) -> list[str]:
+    """The geohash cell containing the point and its 8 neighbours."""
+    lat_step, lon_step = _cell_size(precision)
+    cells = []
+    for lat_offset in (-lat_step, 0.0, lat_step):
+        for lon_offset in (-lon_step, 0.0, lon_step):
+            neighbour_lat = min(max(lat + lat_offset, -90.0), 90.0)
+            neighbour_lon = (lon + lon_offset + 180.0) % 360.0 - 180.0
+            cell = encode_geohash(neighbour_lat, neighbour_lon, precision)
+            if cell not in cells:
+                cells.append(cell)
+    return cells
+
+
+def covered_radius_km(lat: float, precision: int) -> float:
+    """Every point closer than this to the centre lies in one of geohash_cells_around()."""
+    lat_step, lon_step = _cell_size(precision)
+    km_per_degree = radians(1) * EARTH_RADIUS_KM
+    return min(lat_step * km_per_degree, lon_step * km_per_degree * cos(radians(lat)))
+
+
+def distance_km(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    lat1, lon1, lat2, lon2 = map(radians, (lat1, lon1, lat2, lon2))
+    a = sin((lat2 - lat1) / 2) ** 2 + cos(lat1) * cos(lat2) * sin((lon2 - lon1) / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * asin(sqrt(a))
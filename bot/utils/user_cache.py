@@ -0,0 +1,58 @@
+from collections import OrderedDict
+from dataclasses import dataclass
+from database.enums import UserRole
+import time
+
+
+@dataclass(slots=True, frozen=True)
+class UserIdentity:
+    """What the handlers need to know about the author of an update."""
+
+    id: int
+    username: str | None
+    role: UserRole | None
+
+
+class UserCache:
+    """LRU of user identities by Telegram id, so known users are not looked up on every update.
+
+    Entries expire after ``ttl`` seconds, role changes made by the bot invalidate them right away.
+    """
+
+    def __init__(self, max_size: int = 1024, ttl: float = 600.0):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries: OrderedDict[int, tuple[UserIdentity, float]] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, user_id: int) -> UserIdentity | None:
+        entry = self._entries.get(user_id)
+        if entry is not None:
+            identity, expires_at = entry
+            if time.monotonic() < expires_at:
+                self._entries.move_to_end(user_id)
+                self.hits += 1
+                return identity
+            del self._entries[user_id]
+        self.misses += 1
+        return None
+
+    def set(self, identity: UserIdentity):
+        self._entries[identity.id] = (identity, time.monotonic() + self.ttl)
+        self._entries.move_to_end(identity.id)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, user_id: int):
+        self._entries.pop(user_id, None)
+
+    def invalidate_username(self, username: str):
+        for user_id in [user_id for user_id, (identity, _) in self._entries.items() if identity.username == username]:
+            del self._entries[user_id]
+
+    def clear(self):
+        self._entries.clear()
+
+
+user_cache = UserCache()
@@ -16,6 +16,9 @@ class AdvertisementStatus(pyEnum):
     CANCELED = 'Canceled'
 
 
+ACTIVE_ADVERTISEMENT_STATUSES = (AdvertisementStatus.NEW, AdvertisementStatus.VIEWED, AdvertisementStatus.ASSIGNED)
+
+
 class RoomType(pyEnum):
     LIVING = 'Ж'
     NON_LIVING = 'Н'
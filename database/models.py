@@ -1,28 +1,33 @@
-from sqlalchemy import Column, Boolean, Enum, Integer, String, DateTime, ForeignKey, Float
+from sqlalchemy import (Column, BigInteger, Boolean, Enum, Integer, String, DateTime, ForeignKey, Float, Index,
+                        UniqueConstraint, func)
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import declarative_base
 from sqlalchemy.orm import relationship
-from database.enums import UserRole, AdvertisementStatus, EntranceType, ViewType, RoomType, ToiletType
+from database.enums import (UserRole, AdvertisementStatus, EntranceType, ViewType, RoomType, ToiletType,
+                            ACTIVE_ADVERTISEMENT_STATUSES)
 from sqlalchemy.ext.asyncio import AsyncAttrs
 from datetime import datetime
 
 
 Base = declarative_base()
 
+# Relationships default to lazy='raise': every query states what it loads, see bot/service/advertisement.py.
+
 
 class User(AsyncAttrs, Base):
     __tablename__ = 'user'
 
     id = Column(Integer, primary_key=True)
-    username = Column(String)
+    username = Column(String, index=True)
     first_name = Column(String)
     last_name = Column(String)
-    role = Column(Enum(UserRole))
+    role = Column(Enum(UserRole), index=True)
 
     created_at = Column(DateTime, default=datetime.utcnow)
 
-    added_advertisements = relationship('Advertisement', back_populates='added_by', foreign_keys='Advertisement.added_by_id', lazy='select')
-    viewed_advertisements = relationship('Advertisement', back_populates='viewed_by', foreign_keys='Advertisement.viewed_by_id', lazy='select')
-    assigned_advertisements = relationship('Advertisement', back_populates='assigned_to', foreign_keys='Advertisement.assigned_to_id', lazy='select')
+    added_advertisements = relationship('Advertisement', back_populates='added_by', foreign_keys='Advertisement.added_by_id', lazy='raise')
+    viewed_advertisements = relationship('Advertisement', back_populates='viewed_by', foreign_keys='Advertisement.viewed_by_id', lazy='raise')
+    assigned_advertisements = relationship('Advertisement', back_populates='assigned_to', foreign_keys='Advertisement.assigned_to_id', lazy='raise')
 
 
 class RoomInfo(AsyncAttrs, Base):
@@ -34,8 +39,8 @@ class RoomInfo(AsyncAttrs, Base):
     area = Column(Float)
     description = Column(String)
 
-    main_room_id = Column(Integer, ForeignKey('room.id', ondelete='RESTRICT'))
-    main_room = relationship('Room', back_populates='rooms_info', lazy='select')
+    main_room_id = Column(Integer, ForeignKey('room.id', ondelete='RESTRICT'), index=True)
+    main_room = relationship('Room', back_populates='rooms_info', lazy='raise')
 
 
 class Room(AsyncAttrs, Base):
@@ -58,17 +63,33 @@ class Room(AsyncAttrs, Base):
     entrance_type = Column(Enum(EntranceType))
     view_type = Column(Enum(ViewType))
     toilet_type = Column(Enum(ToiletType))
-
-    advertisements = relationship('Advertisement', back_populates='room')
-    rooms_info = relationship('RoomInfo', back_populates='main_room')
+    geo_lat = Column(Float)
+    geo_lon = Column(Float)
+    geohash = Column(String(12))
+    house_fias_id = Column(String, index=True)
+
+    advertisements = relationship('Advertisement', back_populates='room', lazy='raise')
+    rooms_info = relationship('RoomInfo', back_populates='main_room', lazy='raise')
+    metro_stations = relationship(
+        'HouseMetroStation',
+        primaryjoin='foreign(HouseMetroStation.house_fias_id) == Room.house_fias_id',
+        order_by='HouseMetroStation.distance',
+        viewonly=True,
+        lazy='raise',
+    )
 
     created_at = Column(DateTime, default=datetime.utcnow)
 
+    __table_args__ = (
+        Index('ix_room_geohash', 'geohash', postgresql_ops={'geohash': 'varchar_pattern_ops'}),
+    )
+
 
 class Advertisement(AsyncAttrs, Base):
     __tablename__ = 'advertisement'
 
     id = Column(Integer, primary_key=True, autoincrement=True)
+    item_id = Column(BigInteger, unique=True, index=True)
     url = Column(String)
     price = Column(Integer)
     status = Column(Enum(AdvertisementStatus))
@@ -77,17 +98,61 @@ class Advertisement(AsyncAttrs, Base):
     contact_name = Column(String)
     description = Column(String)
 
-    room_id = Column(Integer, ForeignKey('room.id', ondelete='RESTRICT'))
-    room = relationship('Room', back_populates='advertisements')
+    room_id = Column(Integer, ForeignKey('room.id', ondelete='RESTRICT'), index=True)
+    room = relationship('Room', back_populates='advertisements', lazy='raise')
+
+    price_history = relationship('AdvertisementPriceHistory', back_populates='advertisement', lazy='raise')
 
     added_at = Column(DateTime, default=datetime.utcnow)
-    added_by_id = Column(Integer, ForeignKey('user.id', ondelete='RESTRICT'))
-    added_by = relationship('User', back_populates='added_advertisements', foreign_keys=[added_by_id])
+    added_by_id = Column(Integer, ForeignKey('user.id', ondelete='RESTRICT'), index=True)
+    added_by = relationship('User', back_populates='added_advertisements', foreign_keys=[added_by_id], lazy='raise')
 
     viewed_at = Column(DateTime, nullable=True)
-    viewed_by_id = Column(Integer, ForeignKey('user.id', ondelete='RESTRICT'))
-    viewed_by = relationship('User', back_populates='viewed_advertisements', foreign_keys=[viewed_by_id])
+    viewed_by_id = Column(Integer, ForeignKey('user.id', ondelete='RESTRICT'), index=True)
+    viewed_by = relationship('User', back_populates='viewed_advertisements', foreign_keys=[viewed_by_id], lazy='raise')
 
     assigned_at = Column(DateTime, nullable=True)
-    assigned_to_id = Column(Integer, ForeignKey('user.id', ondelete='RESTRICT'))
-    assigned_to = relationship('User', back_populates='assigned_advertisements', foreign_keys=[assigned_to_id])
+    assigned_to_id = Column(Integer, ForeignKey('user.id', ondelete='RESTRICT'), index=True)
+    assigned_to = relationship('User', back_populates='assigned_advertisements', foreign_keys=[assigned_to_id],
+                               lazy='raise')
+
+    __table_args__ = (
+        # matches is_active() in bot/service/advertisement.py, which renders the statuses inline
+        Index('ix_advertisement_active_id', id, postgresql_where=status.in_(ACTIVE_ADVERTISEMENT_STATUSES)),
+    )
+
+
+class AdvertisementPriceHistory(AsyncAttrs, Base):
+    __tablename__ = 'advertisement_price_history'
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    old_price = Column(Integer)
+    new_price = Column(Integer)
+    changed_at = Column(DateTime, default=datetime.utcnow)
+
+    advertisement_id = Column(Integer, ForeignKey('advertisement.id', ondelete='CASCADE'), index=True)
+    advertisement = relationship('Advertisement', back_populates='price_history', lazy='raise')
+
+
+class DadataAddressCache(AsyncAttrs, Base):
+    __tablename__ = 'dadata_address_cache'
+
+    address_key = Column(String, primary_key=True)
+    payload = Column(JSONB)
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+
+class HouseMetroStation(AsyncAttrs, Base):
+    """Nearest metro stations of a building, taken from its Dadata address once."""
+    __tablename__ = 'house_metro_station'
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    house_fias_id = Column(String, nullable=False)
+    name = Column(String, nullable=False)
+    line = Column(String)
+    distance = Column(Float, nullable=False)
+
+    __table_args__ = (
+        UniqueConstraint('house_fias_id', 'name'),
+        Index('ix_house_metro_station_name_distance', func.lower(name), distance),
+    )
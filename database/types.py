@@ -28,6 +28,14 @@ class RoomInfoResponse(BaseModel):
     description: str
 
 
+class MetroStation(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    name: str
+    line: Optional[str] = None
+    distance: float
+
+
 class RoomResponse(BaseModel):
     model_config = ConfigDict(from_attributes=True, use_enum_values=True, arbitrary_types_allowed=True)
 
@@ -48,8 +56,12 @@ class RoomResponse(BaseModel):
     entrance_type: EntranceType
     view_type: ViewType
     toilet_type: ToiletType
+    geo_lat: Optional[float] = None
+    geo_lon: Optional[float] = None
+    house_fias_id: Optional[str] = None
 
     rooms_info: Optional[list[RoomInfoResponse]] = Field()
+    metro_stations: Optional[list[MetroStation]] = []
 
     created_at: datetime
 
@@ -65,6 +77,7 @@ class AdvertisementResponse(BaseModel):
     model_config = ConfigDict(from_attributes=True, use_enum_values=True, arbitrary_types_allowed=True)
 
     advertisement_id: int = Field(alias='id')
+    item_id: Optional[int] = None
     url: str
     price: int
     status: AdvertisementStatus
@@ -145,12 +158,16 @@ class RoomCreate(BaseModel):
     entrance_type: Optional[EntranceType]
     view_type: Optional[ViewType]
     toilet_type: Optional[ToiletType]
+    geo_lat: Optional[float] = None
+    geo_lon: Optional[float] = None
+    house_fias_id: Optional[str] = None
 
     class Config:
         orm_mode = True
 
 
 class AdvertisementCreate(BaseModel):
+    item_id: Optional[int] = None
     url: str
     price: int
     status: AdvertisementStatus = AdvertisementStatus.NEW
@@ -167,7 +184,21 @@ class AdvertisementCreate(BaseModel):
         orm_mode = True
 
 
+class AdvertisementPriceChange(BaseModel):
+    advertisement_id: int
+    old_price: Optional[int]
+    new_price: int
+
+
+class RoomLocation(BaseModel):
+    room_id: int
+    geo_lat: float
+    geo_lon: float
+    house_fias_id: Optional[str] = None
+
+
 class DataToGather(BaseModel):
+    item_id: Optional[int] = None
     url: Optional[str] = None
     price: Optional[int] = None
     status: AdvertisementStatus = AdvertisementStatus.NEW
@@ -196,5 +227,15 @@ class DataToGather(BaseModel):
     entrance_type: Optional[EntranceType] = None
     view_type: Optional[ViewType] = None
     toilet_type: Optional[ToiletType] = None
-
-    rooms_info: Optional[list[RoomInfoCreate]] = []
\ No newline at end of file
+    geo_lat: Optional[float] = None
+    geo_lon: Optional[float] = None
+
+    rooms_info: Optional[list[RoomInfoCreate]] = []
+
+    # house-level Dadata result prefetched right after the ad is parsed
+    house_address: Optional[str] = None
+    house_fias_id: Optional[str] = None
+    house_cadnum: Optional[str] = None
+    resolved_flat: Optional[str] = None
+    resolved_flat_cadnum: Optional[str] = None
+    metro_stations: Optional[list[MetroStation]] = []
\ No newline at end of file
@@ -6,21 +6,42 @@ from telegram.ext import (
     CommandHandler,
     TypeHandler,
     PicklePersistence,
+    ContextTypes,
     filters,
 )
 from telegram import Update
 
+from avito_parser import (
+    RateLimiter,
+    init_client as init_avito_client,
+    close_client as close_avito_client,
+    init_pool as init_parser_pool,
+    close_pool as close_parser_pool,
+    init_cache as init_avito_cache,
+    ResultCache,
+)
+from bot.context import BotContext
 from bot.middlewares import Middleware, SessionMiddleware, UserMiddleware
 
 from bot.handlers.onboarding import handlers as onboarding_handlers
 from bot.handlers.rooms import handlers as rooms_handlers
 from bot.handlers.role import handlers as role_handlers
+from bot.handlers.nearby import handlers as nearby_handlers
+from bot.jobs.crawler import crawl_avito
+from bot.jobs.price_monitor import monitor_prices
+from bot.jobs.db_metrics import log_db_metrics
+from bot.jobs.room_locations import backfill_room_locations
 from bot.config import config
-from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
+from bot.utils.dadata_repository import dadata
+from bot.utils.dadata_cache import DadataCache
+from bot.utils.user_cache import user_cache
+from bot.utils.database import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, AsyncSession
 
 import logging
 from logging.handlers import RotatingFileHandler
 import asyncio
+import datetime
 
 
 logging.basicConfig(
@@ -36,9 +57,63 @@ logging.getLogger("httpx").setLevel(logging.WARNING)
 logger = logging.getLogger(__name__)
 
 
+async def post_init(app: Application):
+    await init_avito_client(
+        max_connections=config.avito_max_connections,
+        max_keepalive_connections=config.avito_max_keepalive_connections,
+        keepalive_expiry=config.avito_keepalive_expiry,
+        timeout=config.avito_timeout,
+        http2=config.avito_http2,
+        max_concurrency=config.avito_max_concurrency,
+        rate_limiter=RateLimiter(
+            rate=config.avito_rate_limit,
+            burst=config.avito_rate_burst,
+            min_rate=config.avito_rate_min,
+            max_wait=config.avito_rate_max_wait,
+        ),
+        max_retries=config.avito_max_retries,
+        retry_max_wait=config.avito_retry_max_wait,
+        streaming=config.avito_streaming,
+    )
+    init_parser_pool(
+        mode=config.avito_parser_mode,
+        max_workers=config.avito_parser_workers,
+        max_queue=config.avito_parser_queue_size,
+    )
+    init_avito_cache(
+        max_size=config.avito_cache_size,
+        ttl=config.avito_cache_ttl,
+    )
+    await dadata.start()
+
+
+async def post_shutdown(app: Application):
+    await close_avito_client()
+    close_parser_pool()
+    await dadata.close()
+
+
 def main():
-    engine = create_async_engine(config.db_url.get_secret_value(), echo=True)
+    engine = create_engine(
+        config.db_url.get_secret_value(),
+        echo=config.db_echo,
+        pool_size=config.db_pool_size,
+        max_overflow=config.db_max_overflow,
+        pool_timeout=config.db_pool_timeout,
+        pool_recycle=config.db_pool_recycle,
+        pool_pre_ping=config.db_pool_pre_ping,
+        statement_cache_size=config.db_statement_cache_size,
+        pgbouncer=config.db_pgbouncer,
+    )
     session_maker = async_sessionmaker(engine, expire_on_commit=False, class_=AsyncSession)
+    dadata.cache = DadataCache(
+        session_maker,
+        max_size=config.dadata_cache_size,
+        ttl=config.dadata_cache_ttl,
+        request_cost=config.dadata_request_cost,
+    )
+    user_cache.max_size = config.user_cache_size
+    user_cache.ttl = config.user_cache_ttl
     middleware = Middleware(
         [
             SessionMiddleware(session_maker),
@@ -49,11 +124,21 @@ def main():
     TOKEN = config.bot_token.get_secret_value()
 
     persistence = PicklePersistence('bot/persistence.pickle')
-    app = Application.builder().token(TOKEN).persistence(persistence).build()
+    app = (
+        Application.builder()
+        .token(TOKEN)
+        .persistence(persistence)
+        .context_types(ContextTypes(context=BotContext))
+        .post_init(post_init)
+        .post_shutdown(post_shutdown)
+        .build()
+    )
 
     app.add_handler(TypeHandler(Update, middleware.on_update), group=-1)
 
     app.add_handler(CommandHandler('start', onboarding_handlers.start))
+    app.add_handler(CommandHandler('nearby', nearby_handlers.nearby))
+    app.add_handler(CommandHandler('metro', nearby_handlers.metro))
 
     plan_handler = ConversationHandler(
         entry_points=[CallbackQueryHandler(rooms_handlers.start_change_plan, pattern=r'change_plan_.*')],
@@ -205,6 +290,45 @@ def main():
 
     app.add_handler(TypeHandler(Update, middleware.after_update), group=1)
 
+    if config.avito_search_url:
+        app.job_queue.run_repeating(
+            crawl_avito,
+            interval=config.avito_crawl_interval,
+            first=60,
+            data={
+                'session_maker': session_maker,
+                'cache': ResultCache(max_size=config.avito_cache_size, ttl=config.avito_cache_ttl),
+            },
+            name='avito_crawler',
+        )
+
+    if config.price_monitor_enabled:
+        app.job_queue.run_daily(
+            monitor_prices,
+            time=datetime.time(hour=config.price_monitor_hour),
+            data={
+                'session_maker': session_maker,
+                'cache': ResultCache(max_size=config.price_monitor_cache_size, ttl=0),
+            },
+            name='price_monitor',
+        )
+
+    if config.room_location_backfill_enabled:
+        app.job_queue.run_once(
+            backfill_room_locations,
+            when=120,
+            data={'session_maker': session_maker},
+            name='room_location_backfill',
+        )
+
+    if config.db_metrics_interval:
+        app.job_queue.run_repeating(
+            log_db_metrics,
+            interval=config.db_metrics_interval,
+            data={'engine': engine},
+            name='db_metrics',
+        )
+
     app.run_polling()
 
 
@@ -0,0 +1,101 @@
+"""baseline schema
+
+The schema as it was before migrations were kept in the repository: users,
+rooms, room infos and advertisements. A database created before then already
+has it, so run ``alembic stamp b3a1f0c2d4e5`` on it and upgrade from there.
+
+Revision ID: b3a1f0c2d4e5
+Revises:
+Create Date: 2026-10-18 09:12:40.118203
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'b3a1f0c2d4e5'
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'user',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('username', sa.String(), nullable=True),
+        sa.Column('first_name', sa.String(), nullable=True),
+        sa.Column('last_name', sa.String(), nullable=True),
+        sa.Column('role', sa.Enum('USER', 'ADMIN', 'DISPATCHER', 'AGENT', name='userrole'), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_table(
+        'room',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('room_area', sa.Float(), nullable=True),
+        sa.Column('flat_area', sa.Float(), nullable=True),
+        sa.Column('number_of_rooms_in_flat', sa.Integer(), nullable=True),
+        sa.Column('flour', sa.Integer(), nullable=True),
+        sa.Column('flours_in_building', sa.Integer(), nullable=True),
+        sa.Column('address', sa.String(), nullable=True),
+        sa.Column('plan_telegram_file_id', sa.String(), nullable=True),
+        sa.Column('flat_number', sa.String(), nullable=True),
+        sa.Column('flat_height', sa.Float(), nullable=True),
+        sa.Column('cadastral_number', sa.String(), nullable=True),
+        sa.Column('house_is_historical', sa.Boolean(), nullable=True),
+        sa.Column('elevator_nearby', sa.Boolean(), nullable=True),
+        sa.Column('under_room_is_living', sa.Boolean(), nullable=True),
+        sa.Column('entrance_type', sa.Enum('STREET', 'YARD', 'ARCH', 'SEPARATE', name='entrancetype'), nullable=True),
+        sa.Column('view_type', sa.Enum('STREET', 'YARD', 'PARK', name='viewtype'), nullable=True),
+        sa.Column('toilet_type', sa.Enum('COMBINED', 'SEPARATE', 'WITHOUTBATH', 'SHOWERONKITCHEN', name='toilettype'),
+                  nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_table(
+        'room_info',
+        sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('number', sa.Integer(), nullable=True),
+        sa.Column('status', sa.Enum('LIVING', 'NON_LIVING', name='roomtype'), nullable=True),
+        sa.Column('area', sa.Float(), nullable=True),
+        sa.Column('description', sa.String(), nullable=True),
+        sa.Column('main_room_id', sa.Integer(), nullable=True),
+        sa.ForeignKeyConstraint(['main_room_id'], ['room.id'], ondelete='RESTRICT'),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_table(
+        'advertisement',
+        sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('url', sa.String(), nullable=True),
+        sa.Column('price', sa.Integer(), nullable=True),
+        sa.Column('status', sa.Enum('NEW', 'VIEWED', 'ASSIGNED', 'DONE', 'CANCELED', name='advertisementstatus'),
+                  nullable=True),
+        sa.Column('contact_phone', sa.String(), nullable=True),
+        sa.Column('contact_status', sa.String(), nullable=True),
+        sa.Column('contact_name', sa.String(), nullable=True),
+        sa.Column('description', sa.String(), nullable=True),
+        sa.Column('room_id', sa.Integer(), nullable=True),
+        sa.Column('added_at', sa.DateTime(), nullable=True),
+        sa.Column('added_by_id', sa.Integer(), nullable=True),
+        sa.Column('viewed_at', sa.DateTime(), nullable=True),
+        sa.Column('viewed_by_id', sa.Integer(), nullable=True),
+        sa.Column('assigned_at', sa.DateTime(), nullable=True),
+        sa.Column('assigned_to_id', sa.Integer(), nullable=True),
+        sa.ForeignKeyConstraint(['added_by_id'], ['user.id'], ondelete='RESTRICT'),
+        sa.ForeignKeyConstraint(['assigned_to_id'], ['user.id'], ondelete='RESTRICT'),
+        sa.ForeignKeyConstraint(['room_id'], ['room.id'], ondelete='RESTRICT'),
+        sa.ForeignKeyConstraint(['viewed_by_id'], ['user.id'], ondelete='RESTRICT'),
+        sa.PrimaryKeyConstraint('id'),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('advertisement')
+    op.drop_table('room_info')
+    op.drop_table('room')
+    op.drop_table('user')
+    for enum_name in ('advertisementstatus', 'roomtype', 'toilettype', 'viewtype', 'entrancetype', 'userrole'):
+        op.execute(f'DROP TYPE IF EXISTS {enum_name}')
@@ -0,0 +1,44 @@
+"""indexes for service queries
+
+Covers the filters and joins in bot/service: user lookups by username and role,
+foreign keys used to load and join advertisements, room infos by room, and a
+partial index for the active advertisements scanned by the price monitor.
+
+Revision ID: c8d2e4f6a1b3
+Revises: b3a1f0c2d4e5
+Create Date: 2026-10-18 09:40:02.561877
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'c8d2e4f6a1b3'
+down_revision: Union[str, None] = 'b3a1f0c2d4e5'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(op.f('ix_user_username'), 'user', ['username'], unique=False)
+    op.create_index(op.f('ix_user_role'), 'user', ['role'], unique=False)
+    op.create_index(op.f('ix_room_info_main_room_id'), 'room_info', ['main_room_id'], unique=False)
+    op.create_index(op.f('ix_advertisement_room_id'), 'advertisement', ['room_id'], unique=False)
+    op.create_index(op.f('ix_advertisement_added_by_id'), 'advertisement', ['added_by_id'], unique=False)
+    op.create_index(op.f('ix_advertisement_viewed_by_id'), 'advertisement', ['viewed_by_id'], unique=False)
+    op.create_index(op.f('ix_advertisement_assigned_to_id'), 'advertisement', ['assigned_to_id'], unique=False)
+    op.create_index('ix_advertisement_active_id', 'advertisement', ['id'], unique=False,
+                    postgresql_where=sa.text("status IN ('NEW', 'VIEWED', 'ASSIGNED')"))
+
+
+def downgrade() -> None:
+    op.drop_index('ix_advertisement_active_id', table_name='advertisement')
+    op.drop_index(op.f('ix_advertisement_assigned_to_id'), table_name='advertisement')
+    op.drop_index(op.f('ix_advertisement_viewed_by_id'), table_name='advertisement')
+    op.drop_index(op.f('ix_advertisement_added_by_id'), table_name='advertisement')
+    op.drop_index(op.f('ix_advertisement_room_id'), table_name='advertisement')
+    op.drop_index(op.f('ix_room_info_main_room_id'), table_name='room_info')
+    op.drop_index(op.f('ix_user_role'), table_name='user')
+    op.drop_index(op.f('ix_user_username'), table_name='user')
@@ -0,0 +1,110 @@
+"""prices, geo search and metro stations
+
+Adds what the bot gained on top of the baseline: advertisement.item_id, room
+coordinates with their geohash and house FIAS id, price history, the Dadata
+address cache and the metro stations of a building. Existing advertisements get
+their item id from the url, rooms get their coordinates and geohash from the
+room_location_backfill job.
+
+Revision ID: d5f7a9b1c3e6
+Revises: c8d2e4f6a1b3
+Create Date: 2026-10-18 14:05:31.406712
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = 'd5f7a9b1c3e6'
+down_revision: Union[str, None] = 'c8d2e4f6a1b3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# same as avito_parser.urls.extract_item_id: the trailing _<digits> of the url path,
+# the path being cut out of the url the way urlsplit does it. When several ads share
+# an item id only the oldest one gets it, the unique index would fail otherwise.
+BACKFILL_ITEM_ID = r"""
+WITH parsed AS (
+    SELECT id, CAST(substring(rtrim(substring(url FROM '^(?:[^:/?#]+:)?(?://[^/?#]*)?([^?#]*)'), '/')
+                              FROM '_(\d+)$') AS BIGINT) AS item_id
+    FROM advertisement
+    WHERE url IS NOT NULL
+)
+UPDATE advertisement
+SET item_id = first_ad.item_id
+FROM (
+    SELECT DISTINCT ON (item_id) id, item_id
+    FROM parsed
+    WHERE item_id IS NOT NULL
+    ORDER BY item_id, id
+) AS first_ad
+WHERE advertisement.id = first_ad.id
+"""
+
+
+def upgrade() -> None:
+    op.add_column('advertisement', sa.Column('item_id', sa.BigInteger(), nullable=True))
+    op.execute(BACKFILL_ITEM_ID)
+    op.create_index(op.f('ix_advertisement_item_id'), 'advertisement', ['item_id'], unique=True)
+
+    op.add_column('room', sa.Column('geo_lat', sa.Float(), nullable=True))
+    op.add_column('room', sa.Column('geo_lon', sa.Float(), nullable=True))
+    op.add_column('room', sa.Column('geohash', sa.String(length=12), nullable=True))
+    op.add_column('room', sa.Column('house_fias_id', sa.String(), nullable=True))
+    op.create_index('ix_room_geohash', 'room', ['geohash'], unique=False,
+                    postgresql_ops={'geohash': 'varchar_pattern_ops'})
+    op.create_index(op.f('ix_room_house_fias_id'), 'room', ['house_fias_id'], unique=False)
+
+    op.create_table(
+        'advertisement_price_history',
+        sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('old_price', sa.Integer(), nullable=True),
+        sa.Column('new_price', sa.Integer(), nullable=True),
+        sa.Column('changed_at', sa.DateTime(), nullable=True),
+        sa.Column('advertisement_id', sa.Integer(), nullable=True),
+        sa.ForeignKeyConstraint(['advertisement_id'], ['advertisement.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index(op.f('ix_advertisement_price_history_advertisement_id'), 'advertisement_price_history',
+                    ['advertisement_id'], unique=False)
+
+    op.create_table(
+        'dadata_address_cache',
+        sa.Column('address_key', sa.String(), nullable=False),
+        sa.Column('payload', postgresql.JSONB(astext_type=sa.Text()), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('address_key'),
+    )
+
+    op.create_table(
+        'house_metro_station',
+        sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('house_fias_id', sa.String(), nullable=False),
+        sa.Column('name', sa.String(), nullable=False),
+        sa.Column('line', sa.String(), nullable=True),
+        sa.Column('distance', sa.Float(), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('house_fias_id', 'name'),
+    )
+    op.create_index('ix_house_metro_station_name_distance', 'house_metro_station',
+                    [sa.text('lower(name)'), 'distance'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_house_metro_station_name_distance', table_name='house_metro_station')
+    op.drop_table('house_metro_station')
+    op.drop_table('dadata_address_cache')
+    op.drop_index(op.f('ix_advertisement_price_history_advertisement_id'), table_name='advertisement_price_history')
+    op.drop_table('advertisement_price_history')
+    op.drop_index(op.f('ix_room_house_fias_id'), table_name='room')
+    op.drop_index('ix_room_geohash', table_name='room')
+    op.drop_column('room', 'house_fias_id')
+    op.drop_column('room', 'geohash')
+    op.drop_column('room', 'geo_lon')
+    op.drop_column('room', 'geo_lat')
+    op.drop_index(op.f('ix_advertisement_item_id'), table_name='advertisement')
+    op.drop_column('advertisement', 'item_id')